@@ -0,0 +1,79 @@
+import datetime
+
+import requests
+import streamlit as st
+from utils import get_campaign_facets, get_catalogue_version
+from campaign_analytics import CampaignAnalytics, UserActivity
+from live_totals import get_donation_log, get_funding_totals
+from profile_data import SignInRequired, get_profile_service
+from session_store import current_token, current_user_id
+
+@st.cache_resource(max_entries=2, show_spinner="Computing analytics...")
+def get_campaign_analytics(catalogue_version, donations_version):
+    """Platform aggregates, recomputed once per (catalogue, donation log) version and shared across sessions."""
+    return CampaignAnalytics(get_campaign_facets(catalogue_version), get_donation_log().columns())
+
+def current_analytics():
+    """Analytics for the current catalogue and donation log."""
+    # Starts the donation subscriber that fills the log, if no page has yet
+    get_funding_totals()
+    return get_campaign_analytics(get_catalogue_version(), get_donation_log().version)
+
+def render_user_activity():
+    """The signed-in user's activity from their history on the backend.
+
+    If the backend cannot be read, falls back to the donations this server
+    has seen on the event stream since it started, and says so.
+    """
+    user_id = current_user_id()
+    try:
+        activity = UserActivity(**get_profile_service().activity(
+            user_id, current_token(), st.session_state.get("user_type")
+        ))
+        since_app_start = False
+    except (SignInRequired, requests.exceptions.RequestException, ValueError):
+        activity = current_analytics().user_activity(user_id)
+        since_app_start = True
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Campaigns Created", f"{activity.campaigns_created:,}")
+    col2.metric("Projects Supported", f"{activity.projects_supported:,}")
+    col3.metric("Total Contributed", f"${activity.total_contributed:,.0f}")
+    if since_app_start:
+        st.caption("Your history could not be loaded; these figures cover only donations since the app started.")
+
+def show():
+    st.header("Platform Analytics")
+    analytics = current_analytics()
+    if not len(analytics.facets):
+        st.info("No campaigns found.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Campaigns", f"{len(analytics.facets):,}", f"{analytics.verified_count:,} verified", delta_color="off")
+    col2.metric("Total Raised", f"${analytics.total_raised:,.0f}")
+    funded_share = analytics.total_raised / analytics.total_target if analytics.total_target else 0
+    col3.metric("Of All Goals", f"{funded_share:.0%}")
+    col4.metric("Fully Funded", f"{analytics.funded_count:,}")
+
+    st.subheader("Funding Progress")
+    st.bar_chart(analytics.funding_distribution, x_label="Funded", y_label="Campaigns")
+
+    st.subheader("By Category")
+    st.dataframe(
+        analytics.category_breakdown(), use_container_width=True, hide_index=True,
+        column_config={"raised": st.column_config.NumberColumn("raised", format="$%d")},
+    )
+
+    st.subheader("Donations Since the App Started, Last 30 Days")
+    days, amounts, counts = analytics.velocity(30)
+    if not counts.any():
+        st.caption("No donations have been received since the app started.")
+    else:
+        st.line_chart({
+            "day": [datetime.date.fromtimestamp(day) for day in days.tolist()],
+            "amount": amounts.tolist(),
+        }, x="day", y="amount")
+        st.caption(f"{int(counts.sum()):,} donations totalling ${amounts.sum():,.0f}")
+
+    st.subheader("Your Activity")
+    render_user_activity()
@@ -8,16 +8,32 @@ Original file is located at
 """
 
 # -*- coding: utf-8 -*-
+import importlib
+from collections import namedtuple
 import streamlit as st
 from streamlit_option_menu import option_menu
 from utils import load_custom_css
-import home
-import explore
-import search
-import profile
-import campaign
-import login
-import register
+from session_store import restore_session, end_session
+from telemetry import count, render_debug_panel, span, start_metrics_server
+
+# Pages are registered by name and their modules imported only when first selected,
+# so a run never pays for the components of pages it does not render.
+Page = namedtuple("Page", ["module", "function", "icon"])
+
+PUBLIC_PAGES = {
+    "Login": Page("login", "show", "box-arrow-in-right"),
+    "Register": Page("register", "show", "person-plus-fill"),
+}
+
+MEMBER_PAGES = {
+    "Browse": Page("home", "show", "house"),
+    "Explore": Page("explore", "show", "compass"),
+    "Search": Page("search", "show", "search"),
+    "Campaign": Page("campaign", "show", "bullseye"),
+    "Create Campaign": Page("profile", "show_creation_form", "plus-circle"),
+    "Profile": Page("profile", "show_profile_details", "person-circle"),
+    "Analytics": Page("analytics", "show", "bar-chart"),
+}
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -29,49 +45,62 @@ st.set_page_config(
 # Load custom CSS for consistent styling
 load_custom_css()
 
+# Expose /metrics on its own port when telemetry is enabled (started once per process)
+start_metrics_server()
+
+def render_page(registry, name):
+    """Imports the selected page's module on first use and renders it."""
+    page = registry[name]
+    count("reruns", page=name)
+    with span("page_render", page=name):
+        getattr(importlib.import_module(page.module), page.function)()
+
+def default_page_index(pages):
+    """Index of the page to open first: ?page=<name>, or Campaign for ?campaign= deep links."""
+    requested = st.query_params.get("page")
+    if requested in pages:
+        return pages.index(requested)
+    if "campaign" in st.query_params and "Campaign" in pages:
+        return pages.index("Campaign")
+    return 0
+
 # --- Authentication State Management ---
 if "authenticated" not in st.session_state:
     st.session_state.authenticated = False
 
+# Resume a reloaded session or drop an expired one, from the process-wide token store
+restore_session()
+
 # --- Main Application Router ---
 if not st.session_state.authenticated:
     # If user is not logged in, show a simple top menu for Login/Register
+    pages = list(PUBLIC_PAGES)
     selected = option_menu(
         menu_title=None,
-        options=["Login", "Register"],
-        icons=["box-arrow-in-right", "person-plus-fill"],
+        options=pages,
+        icons=[page.icon for page in PUBLIC_PAGES.values()],
         orientation="horizontal",
+        default_index=default_page_index(pages),
     )
-    if selected == "Login":
-        login.show()
-    elif selected == "Register":
-        register.show()
+    render_page(PUBLIC_PAGES, selected)
 else:
     # If user is logged in, show the full sidebar navigation
+    pages = list(MEMBER_PAGES)
     with st.sidebar:
         st.title("HAVEN Menu")
         selected = option_menu(
             menu_title="Navigation",
-            options=["Browse", "Explore", "Search", "Campaign", "Create Campaign", "Profile"],
-            icons=["house", "compass", "search", "bullseye", "plus-circle", "person-circle"],
+            options=pages,
+            icons=[page.icon for page in MEMBER_PAGES.values()],
             menu_icon="cast",
-            default_index=0
+            default_index=default_page_index(pages)
         )
 
         if st.button("Logout", key="logout_button"):
-            st.session_state.authenticated = False
+            end_session()
             st.rerun()
 
+        render_debug_panel()
+
     # Route to the selected page
-    if selected == "Browse":
-        home.show()
-    elif selected == "Explore":
-        explore.show()
-    elif selected == "Search":
-        search.show()
-    elif selected == "Campaign":
-        campaign.show()
-    elif selected == "Create Campaign":
-        profile.show_creation_form()
-    elif selected == "Profile":
-        profile.show_profile_details()
+    render_page(MEMBER_PAGES, selected)
@@ -0,0 +1,253 @@
+"""
+HAVEN Crowdfunding Platform - Backend HTTP Client
+Pooled keep-alive session with per-endpoint timeouts, jittered retries and per-service circuit breakers
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from rate_limit import SingleFlight, TokenBucket
+from settings import get_setting
+from telemetry import span
+
+# (connect, read) timeouts in seconds; the longest matching path prefix wins
+DEFAULT_TIMEOUT = (3.05, 10)
+ENDPOINT_TIMEOUTS = {
+    "/api/login": (3.05, 15),
+    "/api/translate": (3.05, 10),
+    "/api/campaigns": (3.05, 10),
+    # Event stream; the backend sends a keep-alive comment well within this
+    "/api/campaigns/events": (3.05, 60),
+    "/api/uploads": (3.05, 120),
+    "/auth/": (3.05, 30),
+}
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without touching the network while the circuit for an endpoint's service is open"""
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised when the process-wide request budget would not allow the call in time"""
+
+
+class CircuitBreaker:
+    """Stops calling the backend after repeated failures, then lets a single trial request through"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent right now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            # Half-open: let one request through to probe the backend
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def service_of(path: str) -> str:
+    """The service an endpoint belongs to, for circuit breaking: its longest prefix in
+    ENDPOINT_TIMEOUTS, else its first two path segments (e.g. /api/users)"""
+    path = path.split("?", 1)[0]
+    matches = [prefix for prefix in ENDPOINT_TIMEOUTS if path.startswith(prefix)]
+    return max(matches, key=len) if matches else "/".join(path.split("/")[:3])
+
+
+def _never_sent(err: requests.exceptions.ConnectionError) -> bool:
+    """Whether a connection error happened before the request could reach the backend"""
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(err.args[0], "reason", None) if err.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class BackendClient:
+    """Thread-safe client for the HAVEN backend, sharing one connection pool across sessions"""
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_maxsize: int = 32,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 4.0,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+        rate_limiter: TokenBucket = None,
+        max_queue_wait: float = 5.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        # One breaker per service, so failures of an optional endpoint (the event
+        # stream, translation) never stop logins or catalogue syncs
+        self.breaker_factory = breaker_factory
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self.rate_limiter = rate_limiter
+        self.max_queue_wait = max_queue_wait
+        self.single_flight = SingleFlight()
+
+        # Retries are handled here rather than by urllib3 so they share the
+        # jittered backoff and feed the circuit breaker.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+
+    def breaker_for(self, path: str) -> CircuitBreaker:
+        service = service_of(path)
+        breaker = self.breakers.get(service)
+        if breaker is None:
+            with self._breakers_lock:
+                breaker = self.breakers.setdefault(service, self.breaker_factory())
+        return breaker
+
+    def timeout_for(self, path: str) -> Tuple[float, float]:
+        """Timeout for an endpoint, from the longest matching prefix in ENDPOINT_TIMEOUTS"""
+        matches = [prefix for prefix in ENDPOINT_TIMEOUTS if path.startswith(prefix)]
+        return ENDPOINT_TIMEOUTS[max(matches, key=len)] if matches else DEFAULT_TIMEOUT
+
+    def _backoff(self, attempt: int, response: requests.Response = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when the backend sends one"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def request(self, method: str, path: str, idempotent: bool = None, **kwargs) -> requests.Response:
+        """Send a request to the backend, retrying transient failures.
+
+        Requests that are not idempotent are only retried when the connection
+        could not be established, so they are never sent twice. Pass
+        idempotent=True for POST endpoints that are safe to repeat. Concurrent
+        identical idempotent requests share a single call and its response.
+        Raises CircuitOpenError while the backend is considered down, and
+        RateLimitExceeded when the request budget is exhausted.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout_for(path))
+
+        key = self._coalescing_key(method, path, kwargs) if idempotent else None
+        if key is None:
+            return self._send(method, path, idempotent, kwargs)
+        return self.single_flight.do(key, lambda: self._send(method, path, idempotent, kwargs))
+
+    @staticmethod
+    def _coalescing_key(method: str, path: str, kwargs: dict) -> Optional[Hashable]:
+        """Identity of a request for coalescing, or None if it should not be shared"""
+        if kwargs.get("data") is not None or kwargs.get("files") is not None or kwargs.get("stream"):
+            return None
+        try:
+            return method, path, json.dumps(
+                [kwargs.get("params"), kwargs.get("json"), kwargs.get("headers")], sort_keys=True
+            )
+        except (TypeError, ValueError):
+            return None
+
+    def _send(self, method: str, path: str, idempotent: bool, kwargs: dict) -> requests.Response:
+        url = f"{self.base_url}{path}"
+        breaker = self.breaker_for(path)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(timeout=self.max_queue_wait):
+                raise RateLimitExceeded(f"Request budget exhausted, not calling {path}")
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Backend circuit for {service_of(path)} is open, not calling {path}")
+            try:
+                with span("backend_request", method=method, endpoint=path):
+                    response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError as err:
+                breaker.record_failure()
+                if attempt >= self.max_retries or not (idempotent or _never_sent(err)):
+                    raise
+                time.sleep(self._backoff(attempt))
+            except requests.exceptions.Timeout:
+                breaker.record_failure()
+                if attempt >= self.max_retries or not idempotent:
+                    raise
+                time.sleep(self._backoff(attempt))
+            else:
+                if response.status_code < 500:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                if response.status_code not in RETRYABLE_STATUS or attempt >= self.max_retries or not idempotent:
+                    # Read the body now, so coalesced callers can all use the response
+                    if not kwargs.get("stream"):
+                        response.content
+                    return response
+                time.sleep(self._backoff(attempt, response))
+                response.close()
+            attempt += 1
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+
+@st.cache_resource
+def get_backend_client(base_url: str) -> BackendClient:
+    """Process-wide client for a backend, so every session reuses the same pooled connections.
+
+    All sessions share one request budget of [performance] max_requests_per_minute.
+    """
+    requests_per_minute = get_setting("performance", "max_requests_per_minute", 60)
+    rate_limiter = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+    return BackendClient(base_url, rate_limiter=rate_limiter)
+
+
+@st.cache_resource
+def get_background_client(base_url: str) -> BackendClient:
+    """Process-wide client for background work (catalogue sync, the donation stream).
+
+    It has its own budget of [performance] background_requests_per_minute, so
+    background traffic never uses up the requests sessions make, and waits
+    longer for a token since nobody is watching a spinner.
+    """
+    requests_per_minute = get_setting("performance", "background_requests_per_minute", 60)
+    rate_limiter = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+    return BackendClient(base_url, pool_maxsize=4, rate_limiter=rate_limiter, max_queue_wait=60)
@@ -0,0 +1,78 @@
+"""
+HAVEN Crowdfunding Platform - Analytics Benchmark
+Compares building CampaignAnalytics over the catalogue columns and donation log against per-dict Python loops
+
+Usage: python benchmarks/bench_analytics.py [--campaigns 10000] [--donations 100000 1000000 5000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from campaign_analytics import CampaignAnalytics, DonationLog, naive_analytics  # noqa: E402
+from campaign_facets import CampaignFacets  # noqa: E402
+from synthetic import make_catalogue  # noqa: E402
+
+# The naive loop is only timed up to this many donations; beyond it, it is extrapolated
+NAIVE_LIMIT = 1000000
+
+
+def make_donations(campaigns, size, donors=50000, seed=5):
+    """Donation columns spread over the last 90 days, with a long tail of repeat donors"""
+    rng = np.random.default_rng(seed)
+    ids = np.array([c["id"] for c in campaigns], dtype=np.int64)
+    now = time.time()
+    return (
+        ids[rng.integers(0, len(ids), size)],
+        np.round(rng.lognormal(3.5, 1.0, size), 2),
+        [f"user-{n}" for n in rng.zipf(1.3, size) % donors],
+        now - rng.random(size) * 90 * 86400,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=10000)
+    parser.add_argument("--donations", type=int, nargs="+", default=[100000, 1000000, 5000000])
+    args = parser.parse_args()
+
+    campaigns = make_catalogue(args.campaigns)
+    facets = CampaignFacets(campaigns, "1")
+    print(f"{'donations':>10} {'vectorized ms':>14} {'user lookup us':>15} {'naive ms':>10}")
+    for size in args.donations:
+        campaign_ids, amounts, donors, timestamps = make_donations(campaigns, size)
+        log = DonationLog()
+        log.extend(campaign_ids, amounts, donors, timestamps)
+
+        start = time.perf_counter()
+        analytics = CampaignAnalytics(facets, log.columns())
+        analytics.category_breakdown()
+        analytics.velocity(30)
+        vectorized_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for n in range(1000):
+            analytics.user_activity(f"user-{n}")
+        lookup_us = (time.perf_counter() - start) * 1000
+
+        naive_size = min(size, NAIVE_LIMIT)
+        rows = [
+            {"campaign_id": campaign_id, "amount": amount, "donor_id": donor}
+            for campaign_id, amount, donor in zip(
+                campaign_ids[:naive_size].tolist(), amounts[:naive_size].tolist(), donors[:naive_size]
+            )
+        ]
+        start = time.perf_counter()
+        naive_analytics(campaigns, rows)
+        naive_ms = (time.perf_counter() - start) * 1000 * size / naive_size
+        print(f"{size:>10} {vectorized_ms:>14.1f} {lookup_us:>15.2f} {naive_ms:>10.1f}"
+              + ("" if naive_size == size else " (extrapolated)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+HAVEN Crowdfunding Platform - Campaign Record Benchmark
+Compares the memory held by the catalogue as CampaignRecords against plain dicts, and the
+per-hit unpickling a st.cache_data catalogue paid that the shared st.cache_resource store does not
+
+Usage: python benchmarks/bench_campaign_records.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from campaign_record import CampaignRecord  # noqa: E402
+from synthetic import make_catalogue  # noqa: E402
+
+
+def allocated_mb(build):
+    """Megabytes still allocated by the object build() returns, and the object"""
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size / 2 ** 20, result
+
+
+def cache_hit_ms(campaigns):
+    """Milliseconds to unpickle the catalogue, as st.cache_data does on every hit"""
+    payload = pickle.dumps(campaigns, protocol=pickle.HIGHEST_PROTOCOL)
+    start = time.perf_counter()
+    pickle.loads(payload)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'campaigns':>10} {'dict MB':>9} {'record MB':>10} {'cache_data hit ms':>18}")
+    for size in args.sizes:
+        # The JSON decoder gives each campaign its own copy of every string, so rebuild them per run
+        dict_mb, dicts = allocated_mb(lambda: [dict(c) for c in pickle.loads(pickle.dumps(make_catalogue(size)))])
+        record_mb, _ = allocated_mb(lambda: [CampaignRecord(c) for c in pickle.loads(pickle.dumps(dicts))])
+        print(f"{size:>10} {dict_mb:>9.1f} {record_mb:>10.1f} {cache_hit_ms(dicts):>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+HAVEN Crowdfunding Platform - Catalogue Sync Benchmark
+Compares applying a catalogue delta to the shared indexes against rebuilding them from scratch
+
+Usage: python benchmarks/bench_catalogue_sync.py [--sizes 1000 10000 100000] [--changes 1 10 100]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from campaign_index import CampaignIndex  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+from synthetic import make_catalogue  # noqa: E402
+
+
+def make_delta(campaigns, changes, rng):
+    """A donation-heavy delta: mostly new totals, plus one new and one removed campaign"""
+    upserted = []
+    for campaign in rng.sample(campaigns, changes):
+        campaign = dict(campaign)
+        campaign["current_amount"] += 100
+        campaign["donors_count"] += 1
+        upserted.append(campaign)
+    new_campaign = dict(rng.choice(campaigns), id=max(c["id"] for c in campaigns) + 1)
+    return upserted + [new_campaign], [rng.choice(campaigns)["id"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--changes", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    print(f"{'campaigns':>10} {'changes':>8} {'delta ms':>10} {'rebuild ms':>11}")
+    for size in args.sizes:
+        campaigns = make_catalogue(size)
+        campaign_index, search_index = CampaignIndex(campaigns, "1"), SearchIndex(campaigns)
+        rng = random.Random(size)
+        for changes in args.changes:
+            upserted, removed = make_delta(campaign_index.campaigns, changes, rng)
+
+            start = time.perf_counter()
+            campaign_index.apply(upserted, removed, str(changes))
+            search_index.update(upserted, removed)
+            delta_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            CampaignIndex(campaign_index.campaigns, str(changes))
+            SearchIndex(campaign_index.campaigns)
+            rebuild_ms = (time.perf_counter() - start) * 1000
+            print(f"{size:>10} {changes:>8} {delta_ms:>10.2f} {rebuild_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+HAVEN Crowdfunding Platform - Page Rendering Benchmark
+Drives app.py headlessly with streamlit.testing.v1.AppTest against the mock backend and records,
+per page and catalogue size: cold and warm script run time, element count, delta payload bytes
+and peak Python memory. Writes a JSON report and optionally compares it against a baseline.
+
+Usage:
+    python benchmarks/bench_pages.py --sizes 100 10000 --output bench_pages.json
+    python benchmarks/bench_pages.py --baseline bench_pages.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_backend import MockBackend  # noqa: E402
+from synthetic import make_catalogue  # noqa: E402
+
+# Page name -> how to reach it: session state to seed, query params, and an optional interaction
+PAGES = {
+    "Register": {"session": {}, "query": {"page": "Register"}},
+    "Browse": {"session": {"authenticated": True, "user_type": "individual"}, "query": {"page": "Browse"}},
+    "Explore": {"session": {"authenticated": True, "user_type": "individual"}, "query": {"page": "Explore"}},
+    "Search": {
+        "session": {"authenticated": True, "user_type": "individual"},
+        "query": {"page": "Search"},
+        "interact": lambda at: at.text_input[0].input("water"),
+    },
+    "Campaign": {"session": {"authenticated": True, "user_type": "individual"}, "query": {"page": "Campaign"}},
+    "Create Campaign": {"session": {"authenticated": True, "user_type": "organization"}, "query": {"page": "Create Campaign"}},
+    "Profile": {"session": {"authenticated": True, "user_type": "organization"}, "query": {"page": "Profile"}},
+    "Analytics": {"session": {"authenticated": True, "user_type": "individual"}, "query": {"page": "Analytics"}},
+}
+
+# Metrics where a higher value than the baseline is a regression
+COMPARED_METRICS = ["warm_ms", "elements", "payload_bytes", "peak_kib"]
+
+
+def _walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from _walk(child)
+
+
+def measure_tree(at):
+    """Count rendered elements and the serialized size of their protos"""
+    elements = payload_bytes = 0
+    for node in _walk(at._tree):
+        proto = getattr(node, "proto", None)
+        if proto is not None:
+            payload_bytes += proto.ByteSize()
+        if not hasattr(node, "children"):
+            elements += 1
+    return elements, payload_bytes
+
+
+def run_page(AppTest, page, spec, reruns):
+    """Render one page in a fresh session and return its metrics"""
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    for key, value in spec["session"].items():
+        at.session_state[key] = value
+    for key, value in spec["query"].items():
+        at.query_params[key] = value
+
+    start = time.perf_counter()
+    at.run()
+    if "interact" in spec:
+        spec["interact"](at).run()
+    cold_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"{page} raised: {at.exception[0].message}")
+
+    warm_samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        warm_samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    at.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    elements, payload_bytes = measure_tree(at)
+    return {
+        "page": page,
+        "cold_ms": round(cold_ms, 2),
+        "warm_ms": round(statistics.median(warm_samples), 2) if warm_samples else None,
+        "elements": elements,
+        "payload_bytes": payload_bytes,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Print metric changes against the baseline and return the regressions"""
+    previous = {(r["catalogue_size"], r["page"]): r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get((result["catalogue_size"], result["page"]))
+        if not before:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            flag = "REGRESSION" if change > tolerance else ""
+            print(f"{result['catalogue_size']:>8} {result['page']:<16} {metric:<14} {old:>12} -> {new:<12} {change:+7.1%} {flag}")
+            if flag:
+                regressions.append((result["catalogue_size"], result["page"], metric, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--output", default="bench_pages.json")
+    parser.add_argument("--baseline", help="report to compare against; exits non-zero on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative increase per metric")
+    args = parser.parse_args()
+
+    backend = MockBackend().start()
+    # utils reads BACKEND_URL when first imported by the app script
+    os.environ["BACKEND_URL"] = backend.url
+    os.chdir(ROOT)
+
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    try:
+        for size in args.sizes:
+            backend.set_catalogue(make_catalogue(size))
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            for page in args.pages:
+                result = run_page(AppTest, page, PAGES[page], args.reruns)
+                result["catalogue_size"] = size
+                results.append(result)
+                print(f"{size:>8} {page:<16} cold {result['cold_ms']:>9.1f} ms  warm {result['warm_ms']:>8.1f} ms  "
+                      f"{result['elements']:>5} elements  {result['payload_bytes']:>9} B  peak {result['peak_kib']:>9.1f} KiB")
+    finally:
+        backend.stop()
+
+    report = {
+        "streamlit_version": st.__version__,
+        "python_version": sys.version.split()[0],
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+HAVEN Crowdfunding Platform - Search Benchmark
+Compares SearchIndex query latency against the old linear title scan in search.show()
+
+Usage: python benchmarks/bench_search.py [--sizes 1000 10000 100000] [--repeat 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex  # noqa: E402
+from synthetic import make_catalogue  # noqa: E402
+
+QUERIES = ["water", "clean water", "sch", "solar power village", "philanthropy health", "kari", "zzz"]
+
+# search.show() renders at most this many results
+RESULT_LIMIT = 60
+
+
+def linear_scan(campaigns, query):
+    return [c for c in campaigns if query.lower() in c['title'].lower()]
+
+
+def time_queries(func, repeat):
+    """Median latency in milliseconds of running func over every query"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in QUERIES:
+            func(query)
+        samples.append((time.perf_counter() - start) * 1000 / len(QUERIES))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'campaigns':>10} {'build ms':>10} {'index ms/q':>11} {'scan ms/q':>10}")
+    for size in args.sizes:
+        campaigns = make_catalogue(size)
+
+        start = time.perf_counter()
+        index = SearchIndex(campaigns)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        index_ms = time_queries(lambda query: index.search(query, RESULT_LIMIT), args.repeat)
+        scan_ms = time_queries(lambda query: linear_scan(campaigns, query), args.repeat)
+        print(f"{size:>10} {build_ms:>10.1f} {index_ms:>11.3f} {scan_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+HAVEN Crowdfunding Platform - Import-Time Profile
+Runs `python -X importtime` for the router's always-imported modules and for each page module,
+and reports what each costs on top of Streamlit itself. With the lazy router only the shared
+modules are paid for at cold start; a page module is paid for the first time it is selected.
+
+Usage: python benchmarks/import_profile.py [--top 10] [--output import_profile.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported on every run of app.py
+SHARED_MODULES = ["streamlit", "streamlit_option_menu", "utils"]
+# Imported only once their page is selected
+PAGE_MODULES = ["login", "register", "home", "explore", "search", "campaign", "profile"]
+
+LINE_PATTERN = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_import(module: str, preload=()):
+    """Cumulative import time (us) of module after preload, and its heaviest dependencies"""
+    statements = [f"import {name}" for name in preload] + [f"import {module}"]
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(statements)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    # Each import is logged as it completes, after everything it imported itself;
+    # top-level imports have a single space of indentation. Skip interpreter
+    # startup (which ends with `site`) and the preloads.
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if not match:
+            continue
+        name, top_level = match.group(4), len(match.group(3)) == 1
+        entries.append((name, int(match.group(1)), int(match.group(2))))
+        if top_level and (name == "site" or name in preload):
+            entries = []
+    cumulative = entries[-1][2] if entries else 0
+    heaviest = sorted(entries[:-1], key=lambda entry: entry[1], reverse=True)
+    return cumulative, heaviest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=5, help="heaviest dependencies to list per module")
+    parser.add_argument("--output", help="write the profile as JSON")
+    args = parser.parse_args()
+
+    report = {"python_version": sys.version.split()[0], "shared": {}, "pages": {}}
+
+    print("Always imported (cold start):")
+    for index, module in enumerate(SHARED_MODULES):
+        cumulative, heaviest = profile_import(module, SHARED_MODULES[:index])
+        report["shared"][module] = {"cumulative_us": cumulative, "heaviest": heaviest[:args.top]}
+        print(f"  {module:<24} {cumulative / 1000:>8.1f} ms")
+
+    print("Imported on first selection (on top of the shared modules):")
+    for module in PAGE_MODULES:
+        cumulative, heaviest = profile_import(module, SHARED_MODULES)
+        report["pages"][module] = {"cumulative_us": cumulative, "heaviest": heaviest[:args.top]}
+        print(f"  {module:<24} {cumulative / 1000:>8.1f} ms")
+        for name, self_us, _ in heaviest[:args.top]:
+            print(f"      {name:<40} {self_us / 1000:>7.1f} ms self")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Profile written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
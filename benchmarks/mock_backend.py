@@ -0,0 +1,337 @@
+"""
+HAVEN Crowdfunding Platform - Mock Backend
+Minimal in-process stand-in for the FastAPI backend, for benchmarks and local testing
+
+Usage: python benchmarks/mock_backend.py [--port 8000] [--campaigns 1000] [--churn 0]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from synthetic import make_catalogue
+
+
+class MockBackend:
+    """Serves a synthetic catalogue over HTTP on a background thread"""
+
+    def __init__(self, campaigns: List[Dict] = None, host: str = "127.0.0.1", port: int = 0):
+        self.lock = threading.RLock()
+        self.campaigns: List[Dict] = []
+        self.by_id: Dict[int, Dict] = {}
+        self.version = 0
+        self.modified_at = time.time()
+        # (version, campaign id) per change; deltas older than log_start are gone (410)
+        self.change_log: List[tuple] = []
+        self.log_start = 0
+        # Donation events for the /api/campaigns/events stream, as (event id, payload)
+        self.events: List[tuple] = []
+        self.events_changed = threading.Condition(self.lock)
+        # Fake payment processor: outcome per idempotency key, and the number of real charges
+        self.payments: Dict[str, tuple] = {}
+        self.payments_in_flight: Dict[str, threading.Event] = {}
+        self.payment_delay = 0.2
+        self.decline_above = 10000
+        self.charges = 0
+        self.request_counts: Dict[str, int] = {}
+        self.set_catalogue(campaigns or [])
+
+        backend = self
+
+        class Handler(MockBackendHandler):
+            pass
+
+        Handler.backend = backend
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-backend", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def set_catalogue(self, campaigns: List[Dict]):
+        """Replace the whole catalogue; clients behind this version must resync fully"""
+        with self.lock:
+            self.by_id = {campaign["id"]: campaign for campaign in campaigns}
+            self.campaigns = list(self.by_id.values())
+            self.version += 1
+            self.modified_at = time.time()
+            self.change_log = []
+            self.log_start = self.version
+
+    def upsert_campaigns(self, campaigns: Iterable[Dict]):
+        """Add or replace campaigns as one new catalogue version"""
+        with self.lock:
+            self.version += 1
+            for campaign in campaigns:
+                self.by_id[campaign["id"]] = campaign
+                self.change_log.append((self.version, campaign["id"]))
+                event_id = self.events[-1][0] + 1 if self.events else 1
+                self.events.append((event_id, {
+                    "campaign_id": campaign["id"],
+                    "current_amount": campaign["current_amount"],
+                    "donors_count": campaign["donors_count"],
+                }))
+            del self.events[:-1000]
+            self.campaigns = list(self.by_id.values())
+            self.modified_at = time.time()
+            self.events_changed.notify_all()
+
+    def remove_campaigns(self, campaign_ids: Iterable[int]):
+        """Remove campaigns as one new catalogue version"""
+        with self.lock:
+            self.version += 1
+            for campaign_id in campaign_ids:
+                self.by_id.pop(campaign_id, None)
+                self.change_log.append((self.version, campaign_id))
+            self.campaigns = list(self.by_id.values())
+            self.modified_at = time.time()
+
+    def changes_since(self, since: int) -> Optional[Dict]:
+        """The delta from version `since` to the current one, or None if it is no longer known"""
+        with self.lock:
+            if since < self.log_start or since > self.version:
+                return None
+            changed = dict.fromkeys(campaign_id for version, campaign_id in self.change_log if version > since)
+            return {
+                "version": str(self.version),
+                "upserted": [self.by_id[campaign_id] for campaign_id in changed if campaign_id in self.by_id],
+                "removed": [campaign_id for campaign_id in changed if campaign_id not in self.by_id],
+            }
+
+    def charge(self, idempotency_key: str, campaign_id: int, amount: float) -> tuple:
+        """Take a payment, at most once per idempotency key; returns (status, payload)"""
+        with self.lock:
+            outcome = self.payments.get(idempotency_key)
+            if outcome is not None:
+                return outcome
+            in_flight = self.payments_in_flight.get(idempotency_key)
+            leader = in_flight is None
+            if leader:
+                in_flight = self.payments_in_flight[idempotency_key] = threading.Event()
+        if not leader:
+            # A concurrent retry of the same payment gets the same outcome
+            in_flight.wait()
+            return self.payments[idempotency_key]
+
+        time.sleep(self.payment_delay)
+        with self.lock:
+            if amount > self.decline_above:
+                outcome = (402, {"detail": "Your card was declined."})
+            elif campaign_id not in self.by_id:
+                outcome = (404, {"detail": "Campaign not found"})
+            else:
+                campaign = dict(self.by_id[campaign_id])
+                campaign["current_amount"] += amount
+                campaign["donors_count"] += 1
+                self.upsert_campaigns([campaign])
+                self.charges += 1
+                outcome = (200, {
+                    "contribution_id": self.charges,
+                    "status": "confirmed",
+                    "campaign_id": campaign_id,
+                    "amount": amount,
+                    "current_amount": campaign["current_amount"],
+                    "donors_count": campaign["donors_count"],
+                })
+            self.payments[idempotency_key] = outcome
+            del self.payments_in_flight[idempotency_key]
+        in_flight.set()
+        return outcome
+
+    def churn(self, interval: float, rng: random.Random = None):
+        """Simulate donations: every `interval` seconds raise the total of a random campaign"""
+        rng = rng or random.Random()
+
+        def donate():
+            while True:
+                time.sleep(interval)
+                with self.lock:
+                    if not self.campaigns:
+                        continue
+                    campaign = dict(rng.choice(self.campaigns))
+                    campaign["current_amount"] += rng.choice((10, 25, 50, 100, 250))
+                    campaign["donors_count"] += 1
+                    self.upsert_campaigns([campaign])
+
+        threading.Thread(target=donate, name="mock-backend-churn", daemon=True).start()
+
+    def count(self, route: str):
+        with self.lock:
+            self.request_counts[route] = self.request_counts.get(route, 0) + 1
+
+    def start(self) -> "MockBackend":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockBackend":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class MockBackendHandler(BaseHTTPRequestHandler):
+    backend: MockBackend = None
+    protocol_version = "HTTP/1.1"
+    # Seconds between keep-alive comments on an idle event stream
+    keepalive_interval = 15
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status: int = 200, headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _stream_events(self):
+        """Server-sent donation events, replaying any after Last-Event-ID"""
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        backend = self.backend
+        last_id = self.headers.get("Last-Event-ID")
+        with backend.lock:
+            last_id = int(last_id) if last_id and last_id.isdigit() else (backend.events[-1][0] if backend.events else 0)
+        try:
+            while True:
+                with backend.events_changed:
+                    backend.events_changed.wait_for(
+                        lambda: backend.events and backend.events[-1][0] > last_id, timeout=self.keepalive_interval
+                    )
+                    pending = [(event_id, payload) for event_id, payload in backend.events if event_id > last_id]
+                if not pending:
+                    self.wfile.write(b": keepalive\n\n")
+                for event_id, payload in pending:
+                    self.wfile.write(f"id: {event_id}\nevent: donation\ndata: {json.dumps(payload)}\n\n".encode("utf-8"))
+                    last_id = event_id
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _receive_upload(self):
+        """Consume a multipart upload in chunks, as the real backend should, and hash it"""
+        remaining = int(self.headers.get("Content-Length") or 0)
+        digest = hashlib.sha256()
+        while remaining:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+        body_hash = digest.hexdigest()
+        self._send_json({"upload_id": body_hash[:16], "bytes": int(self.headers.get("Content-Length") or 0)})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.backend.count(f"GET {url.path}")
+
+        if url.path == "/api/campaigns":
+            offset, limit = int(query.get("offset", 0)), int(query.get("limit", 12))
+            with self.backend.lock:
+                items = self.backend.campaigns[offset:offset + limit]
+                total, version = len(self.backend.campaigns), self.backend.version
+            self._send_json({"items": items, "total": total, "version": str(version)})
+        elif url.path == "/api/campaigns/changes":
+            with self.backend.lock:
+                etag, modified_at = f'"v{self.backend.version}"', self.backend.modified_at
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            delta = self.backend.changes_since(int(query.get("since", 0)))
+            if delta is None:
+                self._send_json({"detail": "Version no longer available"}, status=410)
+                return
+            self._send_json(delta, headers={"ETag": etag, "Last-Modified": formatdate(modified_at, usegmt=True)})
+        elif url.path == "/api/campaigns/events":
+            self._stream_events()
+        else:
+            self._send_json({"detail": "Not Found"}, status=404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.backend.count(f"POST {url.path}")
+        if url.path == "/api/uploads":
+            self._receive_upload()
+            return
+        payload = self._read_json()
+
+        if url.path == "/api/login":
+            if payload.get("password") != "password123":
+                self._send_json({"detail": "Incorrect email or password"}, status=401)
+                return
+            user_type = "organization" if payload.get("email", "").startswith("org") else "individual"
+            self._send_json({"token": f"mock-token-{user_type}", "user_type": user_type})
+        elif url.path == "/api/refresh":
+            token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+            if not token.startswith("mock-token"):
+                self._send_json({"detail": "Invalid token"}, status=401)
+                return
+            self._send_json({"token": token})
+        elif url.path == "/api/translate/quick":
+            self._send_json({"translated_text": f"[{query.get('target_language')}] {query.get('text', '')}"})
+        elif url.path == "/api/contributions":
+            key = self.headers.get("Idempotency-Key")
+            if not key:
+                self._send_json({"detail": "Idempotency-Key header required"}, status=400)
+                return
+            status, body = self.backend.charge(key, payload.get("campaign_id"), payload.get("amount", 0))
+            self._send_json(body, status=status)
+        elif url.path == "/api/translate/batch":
+            language = payload.get("target_language")
+            self._send_json({"translations": [f"[{language}] {text}" for text in payload.get("texts", [])]})
+        else:
+            self._send_json({"detail": "Not Found"}, status=404)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--campaigns", type=int, default=1000)
+    parser.add_argument("--churn", type=float, default=0, help="seconds between simulated donations (0: none)")
+    args = parser.parse_args()
+
+    backend = MockBackend(make_catalogue(args.campaigns), port=args.port).start()
+    if args.churn:
+        backend.churn(args.churn)
+    print(f"Mock backend serving {args.campaigns} campaigns at {backend.url} (Ctrl+C to stop)")
+    try:
+        backend.thread.join()
+    except KeyboardInterrupt:
+        backend.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+HAVEN Crowdfunding Platform - Synthetic Catalogue
+Deterministic fake campaigns for benchmarks, shaped like the records returned by /api/campaigns
+"""
+
+import itertools
+import random
+from typing import Dict, List
+
+CATEGORIES = ["Education", "Health", "Community", "Environment", "Animals", "Disaster Relief", "Arts", "Technology"]
+
+COMMON_WORDS = (
+    "clean water village school children rural india education health clinic medicine community "
+    "art mural library books solar power sustainability philanthropy forest trees planting river "
+    "flood relief shelter food meals women empowerment skills training computers girls scholarship "
+    "hospital surgery elderly care animals rescue dogs shelter music youth sports playground garden "
+    "farmers seeds irrigation wells toilets sanitation hygiene masks vaccines ambulance orphans"
+).split()
+
+SYLLABLES = "ka ri mu so ten la vi dor pa ne shi ra go lu an ti be mo"
+
+
+def _make_vocabulary(size: int = 20000, seed: int = 11) -> List[str]:
+    """Common words followed by pseudo-words, so word frequencies follow a long tail"""
+    rng = random.Random(seed)
+    syllables = SYLLABLES.split()
+    words = dict.fromkeys(COMMON_WORDS)
+    while len(words) < size:
+        words["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))] = None
+    return list(words)
+
+
+WORDS = _make_vocabulary()
+# Zipf-like cumulative weights: the n-th word is picked with probability proportional to 1/n
+CUMULATIVE_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+
+
+def _words(rng: random.Random, count: int) -> List[str]:
+    return rng.choices(WORDS, cum_weights=CUMULATIVE_WEIGHTS, k=count)
+
+
+def make_campaign(campaign_id: int, rng: random.Random) -> Dict:
+    """Build one synthetic campaign record"""
+    target = rng.choice([1000, 2500, 5000, 10000, 15000, 25000, 50000, 100000])
+    category = rng.choice(CATEGORIES)
+    title_words = _words(rng, rng.randint(3, 6))
+    return {
+        "id": campaign_id,
+        "title": " ".join(title_words).title(),
+        "image": f"https://placehold.co/600x300/E8D8B9/000000?text={category}",
+        "current_amount": rng.randint(0, int(target * 1.2)),
+        "target_amount": target,
+        "donors_count": rng.randint(0, 2000),
+        "category": category,
+        "verified": rng.random() < 0.85,
+        "description": " ".join(_words(rng, rng.randint(20, 60))).capitalize() + ".",
+    }
+
+
+def make_catalogue(size: int, seed: int = 7) -> List[Dict]:
+    """Build a catalogue of `size` synthetic campaigns with ids 1..size"""
+    rng = random.Random(seed)
+    return [make_campaign(campaign_id, rng) for campaign_id in range(1, size + 1)]
@@ -1,33 +1,52 @@
+import html
+
 import streamlit as st
-from utils import get_all_campaigns, simplify_text
+from utils import get_campaign_index, simplify_campaign_description
 from streamlit_extras.stoggle import stoggle
-from streamlit_notify import notify
+from contributions import render_contribution_panel
+from image_cache import campaign_image
+from live_totals import render_funding_progress
+from translation_memory import localize_campaign, start_pretranslation
 
 def show():
     st.header("Campaign Details")
-    campaigns = get_all_campaigns()
-    campaign_titles = {c['title']: c['id'] for c in campaigns}
-    selected_title = st.selectbox("Select a Campaign to View", campaign_titles.keys())
-    
-    campaign_id = campaign_titles[selected_title]
-    campaign = next((c for c in campaigns if c['id'] == campaign_id), None)
+    index = get_campaign_index()
+
+    # Deep links (?campaign=<id or slug>) skip the selectbox entirely
+    linked = st.query_params.get("campaign")
+    campaign = index.resolve(linked) if linked else None
+    if campaign:
+        if st.button("← All campaigns", key="campaign_back"):
+            del st.query_params["campaign"]
+            st.rerun()
+    else:
+        if linked:
+            st.warning("The linked campaign could not be found.")
+        campaign_id = st.selectbox("Select a Campaign to View", index.ids, format_func=index.title_for)
+        campaign = index.get(campaign_id)
     lang = st.session_state.get('language', 'en')
+    if lang != 'en':
+        # Translates campaigns in the background from here on (started once per process)
+        start_pretranslation()
 
     if campaign:
-        st.image(campaign['image'], use_column_width=True)
+        # Title and description come pretranslated from the local translation memory
+        campaign = localize_campaign(campaign, lang)
+        # Hero-sized variant from the app's static path (the original until it is ready)
+        # Escaped: for hosts that are not allowed this is the campaign's own, user-supplied URL
+        hero_url = html.escape(campaign_image(campaign, "hero") or "", quote=True)
+        st.markdown(f'<img src="{hero_url}" alt="" style="width: 100%;">', unsafe_allow_html=True)
         st.title(campaign['title'])
         
-        simplified_desc = simplify_text(campaign['description'], lang)
+        simplified_desc = simplify_campaign_description(campaign, lang)
         stoggle("Read Campaign Description", simplified_desc)
         
-        st.progress(campaign['current_amount'] / campaign['target_amount'])
-        st.markdown(f"**${campaign['current_amount']:,}** raised of **${campaign['target_amount']:,}** goal")
+        # Redraws itself from the shared live totals; the rest of the page does not rerun
+        render_funding_progress(campaign)
         
         if campaign['verified']:
             st.success("This project is verified and open for funding.")
-            with st.form("contribution_form"):
-                amount = st.number_input("Enter your contribution amount", min_value=5)
-                if st.form_submit_button("Contribute Now"):
-                    notify(f"Thank you for your ${amount} contribution!", "success")
+            # Payments run on the shared contribution queue; only this panel reruns while they do
+            render_contribution_panel(campaign)
         else:
             st.warning("This project is under review and not accepting funding.")
@@ -0,0 +1,234 @@
+"""
+HAVEN Crowdfunding Platform - Campaign Analytics
+Platform and per-user funding aggregates computed with NumPy over the catalogue columns and a donation log
+"""
+
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from campaign_facets import FUNDING_BUCKETS, CampaignFacets
+
+# Rows the donation log allocates up front; it doubles when full
+INITIAL_LOG_CAPACITY = 4096
+
+DAY_SECONDS = 86400
+
+
+class DonationColumns(NamedTuple):
+    """A consistent snapshot of the donation log, one array per column"""
+    campaign_ids: np.ndarray
+    amounts: np.ndarray
+    timestamps: np.ndarray
+    donor_codes: np.ndarray
+    # The log's donor id -> code table; codes are stable, and ones at or past
+    # donor_count were added after the snapshot
+    donor_index: Dict[str, int]
+    donor_count: int
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+
+class DonationLog:
+    """Append-only, column-oriented log of individual donations.
+
+    Rows are appended into preallocated arrays under a lock; readers take a
+    snapshot of views up to the current length and never block writers,
+    since rows below that length are never written again. Donor ids are
+    stored as integer codes. The row count doubles as the log's version.
+    """
+
+    def __init__(self, capacity: int = INITIAL_LOG_CAPACITY):
+        self._campaign_ids = np.empty(capacity, dtype=np.int64)
+        self._amounts = np.empty(capacity, dtype=np.float64)
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._donor_codes = np.empty(capacity, dtype=np.int32)
+        self._donor_index: Dict[str, int] = {}
+        self._donors: List[str] = []
+        self._length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def version(self) -> int:
+        return self._length
+
+    def _donor_code(self, donor_id) -> int:
+        # Anonymous donations are code -1 and left out of per-user aggregates
+        if donor_id is None or donor_id == "":
+            return -1
+        # Ids arrive as ints or strings depending on the backend; look-ups use strings
+        donor_id = str(donor_id)
+        code = self._donor_index.get(donor_id)
+        if code is None:
+            code = self._donor_index[donor_id] = len(self._donors)
+            self._donors.append(donor_id)
+        return code
+
+    def _grow(self, needed: int):
+        capacity = len(self._amounts)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        # Existing snapshots keep the old arrays alive; new rows go to the copies
+        for name in ("_campaign_ids", "_amounts", "_timestamps", "_donor_codes"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._length] = old[:self._length]
+            setattr(self, name, new)
+
+    def append(self, campaign_id: int, amount: float, donor_id: str = None, timestamp: float = None):
+        self.extend([campaign_id], [amount], [donor_id], [time.time() if timestamp is None else timestamp])
+
+    def extend(self, campaign_ids: Sequence[int], amounts: Sequence[float],
+               donor_ids: Sequence[Optional[str]], timestamps: Sequence[float]):
+        """Append many donations at once, e.g. a history page from the backend"""
+        with self._lock:
+            start, count = self._length, len(amounts)
+            self._grow(start + count)
+            end = start + count
+            self._campaign_ids[start:end] = campaign_ids
+            self._amounts[start:end] = amounts
+            self._timestamps[start:end] = timestamps
+            self._donor_codes[start:end] = [self._donor_code(donor_id) for donor_id in donor_ids]
+            self._length = end
+
+    def columns(self) -> DonationColumns:
+        with self._lock:
+            length = self._length
+            return DonationColumns(
+                self._campaign_ids[:length], self._amounts[:length], self._timestamps[:length],
+                self._donor_codes[:length], self._donor_index, len(self._donors),
+            )
+
+
+class UserActivity(NamedTuple):
+    campaigns_created: int
+    projects_supported: int
+    total_contributed: float
+    donations: int
+
+
+class CampaignAnalytics:
+    """Aggregates over one catalogue version and one donation log snapshot.
+
+    Catalogue-wide figures come from the facet columns and per-donor totals
+    from bincounts over the log, so building an instance is a few passes
+    over each array and a user's activity is then an array lookup.
+    """
+
+    def __init__(self, facets: CampaignFacets, donations: DonationColumns, now: float = None):
+        self.facets = facets
+        self.donations = donations
+        self.now = time.time() if now is None else now
+
+        self.total_raised = float(facets.current.sum())
+        self.total_target = float(facets.target.sum())
+        self.funded_count = int(np.count_nonzero(facets.current >= facets.target))
+        self.verified_count = int(np.count_nonzero(facets.verified))
+        self.funding_distribution = {
+            label: int(np.count_nonzero(bitset)) for label, bitset in facets.funding_bitsets.items()
+        }
+
+        categories = len(facets.categories)
+        codes = facets.category_codes.astype(np.intp)
+        self.category_campaigns = np.bincount(codes, minlength=categories)
+        self.category_raised = np.bincount(codes, weights=facets.current, minlength=categories)
+        self.category_donors = np.bincount(codes, weights=facets.donors, minlength=categories).astype(np.int64)
+
+        self._creators = self._creator_counts(facets.campaigns)
+        self.donor_supported, self.donor_totals, self.donor_donations = self._donor_totals(donations)
+
+    @staticmethod
+    def _creator_counts(campaigns) -> Dict[str, int]:
+        # Creators are a free-form optional field, so this is the one pass over the records
+        counts: Dict[str, int] = {}
+        for campaign in campaigns:
+            creator = campaign.get("creator_id")
+            if creator is not None:
+                counts[str(creator)] = counts.get(str(creator), 0) + 1
+        return counts
+
+    @staticmethod
+    def _donor_totals(donations: DonationColumns) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Projects supported, total contributed and donation count, indexed by donor code"""
+        known = donations.donor_codes >= 0
+        codes = donations.donor_codes[known].astype(np.intp)
+        donors = donations.donor_count
+        totals = np.bincount(codes, weights=donations.amounts[known], minlength=donors)
+        counts = np.bincount(codes, minlength=donors)
+        if not len(codes):
+            return counts, totals, counts
+        # Distinct (donor, campaign) pairs, packed into one int64 and sorted so repeats are adjacent
+        campaign_ids = donations.campaign_ids[known]
+        stride = int(campaign_ids.max()) + 1
+        pairs = codes.astype(np.int64) * stride + campaign_ids
+        pairs.sort()
+        first = np.ones(len(pairs), dtype=bool)
+        first[1:] = pairs[1:] != pairs[:-1]
+        supported = np.bincount(pairs[first] // stride, minlength=donors)
+        return supported, totals, counts
+
+    def category_breakdown(self) -> List[Dict]:
+        """Campaigns, amount raised and donors per category, largest amount raised first"""
+        rows = [
+            {
+                "category": name,
+                "campaigns": int(self.category_campaigns[code]),
+                "raised": float(self.category_raised[code]),
+                "donors": int(self.category_donors[code]),
+            }
+            for code, name in enumerate(self.facets.categories)
+        ]
+        return sorted(rows, key=lambda row: row["raised"], reverse=True)
+
+    def velocity(self, days: int = 30) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(day start timestamps, amount donated, donations) per day over the last `days` days"""
+        start = (self.now // DAY_SECONDS - days + 1) * DAY_SECONDS
+        timestamps = self.donations.timestamps
+        recent = timestamps >= start
+        days_ago = ((timestamps[recent] - start) // DAY_SECONDS).astype(np.intp)
+        in_range = days_ago < days
+        days_ago = days_ago[in_range]
+        amounts = np.bincount(days_ago, weights=self.donations.amounts[recent][in_range], minlength=days)
+        counts = np.bincount(days_ago, minlength=days)
+        return start + np.arange(days) * DAY_SECONDS, amounts, counts
+
+    def user_activity(self, user_id: Optional[str]) -> UserActivity:
+        if not user_id:
+            return UserActivity(0, 0, 0.0, 0)
+        created = self._creators.get(str(user_id), 0)
+        code = self.donations.donor_index.get(str(user_id))
+        if code is None or code >= self.donations.donor_count:
+            return UserActivity(created, 0, 0.0, 0)
+        return UserActivity(
+            created, int(self.donor_supported[code]), float(self.donor_totals[code]), int(self.donor_donations[code])
+        )
+
+
+def naive_analytics(campaigns: Sequence[Dict], donations: Sequence[Dict]) -> Dict:
+    """The same platform figures from per-dict Python loops; the baseline for benchmarks and checks"""
+    summary = {"total_raised": 0.0, "funding": {label: 0 for label, _, _ in FUNDING_BUCKETS}, "categories": {}, "donors": {}}
+    for campaign in campaigns:
+        summary["total_raised"] += campaign["current_amount"]
+        pct = campaign["current_amount"] / campaign["target_amount"] * 100 if campaign["target_amount"] > 0 else 0.0
+        for label, lower, upper in FUNDING_BUCKETS:
+            if lower <= pct < upper:
+                summary["funding"][label] += 1
+        row = summary["categories"].setdefault(campaign["category"], [0, 0.0, 0])
+        row[0] += 1
+        row[1] += campaign["current_amount"]
+        row[2] += campaign.get("donors_count", 0)
+    for donation in donations:
+        if donation.get("donor_id"):
+            totals = summary["donors"].setdefault(donation["donor_id"], [set(), 0.0, 0])
+            totals[0].add(donation["campaign_id"])
+            totals[1] += donation["amount"]
+            totals[2] += 1
+    return summary
@@ -0,0 +1,156 @@
+"""
+HAVEN Crowdfunding Platform - Campaign Facets
+NumPy column store over the catalogue for the Explore page's facet counts, filters and sorts
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Funding percentage buckets as (label, lower bound inclusive, upper bound exclusive)
+FUNDING_BUCKETS = (
+    ("Under 25%", 0, 25),
+    ("25–50%", 25, 50),
+    ("50–75%", 50, 75),
+    ("75–100%", 75, 100),
+    ("Fully funded", 100, np.inf),
+)
+
+# Positions of the sort permutation examined per step when producing results lazily
+ITER_CHUNK = 4096
+
+SORTS = ("Most funded", "Closest to goal", "Most donors", "Newest")
+
+VERIFIED_OPTIONS = ("All", "Verified", "Under review")
+
+
+class FacetFilters(NamedTuple):
+    """The Explore page's current selection; empty selections do not filter"""
+    categories: Tuple[str, ...] = ()
+    verified: str = "All"
+    funding: Tuple[str, ...] = ()
+    target_range: Optional[Tuple[float, float]] = None
+
+
+class FacetResult(NamedTuple):
+    mask: np.ndarray
+    total: int
+    category_counts: Dict[str, int]
+    verified_counts: Dict[str, int]
+    funding_counts: Dict[str, int]
+
+
+class CampaignFacets:
+    """Columns of the catalogue's filterable fields, with facet bitsets and sort orders precomputed.
+
+    A query ORs and ANDs boolean bitsets and counts each facet under the other
+    facets' masks; results are then read off a presorted permutation only as
+    far as they are displayed. Nothing loops over campaigns in Python.
+    """
+
+    def __init__(self, campaigns: Sequence[Dict], version: str = ""):
+        self.campaigns = campaigns
+        self.version = version
+        count = len(campaigns)
+
+        self.ids = np.fromiter((c["id"] for c in campaigns), dtype=np.int64, count=count)
+        self.current = np.fromiter((c["current_amount"] for c in campaigns), dtype=np.float64, count=count)
+        self.target = np.fromiter((c["target_amount"] for c in campaigns), dtype=np.float64, count=count)
+        self.donors = np.fromiter((c.get("donors_count", 0) for c in campaigns), dtype=np.int64, count=count)
+        self.verified = np.fromiter((bool(c["verified"]) for c in campaigns), dtype=bool, count=count)
+
+        category_codes: Dict[str, int] = {}
+        codes = [category_codes.setdefault(c["category"], len(category_codes)) for c in campaigns]
+        self.categories: List[str] = list(category_codes)
+        self.category_codes = np.array(codes, dtype=np.int16)
+        self.category_bitsets = {name: self.category_codes == code for name, code in category_codes.items()}
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.funded_pct = np.where(self.target > 0, self.current / self.target * 100, 0.0)
+        self.funding_bitsets = {
+            label: (self.funded_pct >= lower) & (self.funded_pct < upper) for label, lower, upper in FUNDING_BUCKETS
+        }
+
+        # Stable permutations, one per sort, computed once per catalogue version
+        remaining = np.where(self.current < self.target, self.target - self.current, np.inf)
+        self.orders = {
+            "Most funded": np.argsort(-self.current, kind="stable"),
+            # Campaigns still short of their goal by the smallest amount first; funded ones last
+            "Closest to goal": np.argsort(remaining, kind="stable"),
+            "Most donors": np.argsort(-self.donors, kind="stable"),
+            # Ids are assigned in creation order
+            "Newest": np.argsort(-self.ids, kind="stable"),
+        }
+
+    def __len__(self) -> int:
+        return len(self.campaigns)
+
+    @property
+    def target_bounds(self) -> Tuple[float, float]:
+        if not len(self):
+            return 0.0, 0.0
+        return float(self.target.min()), float(self.target.max())
+
+    def _union(self, bitsets: Dict[str, np.ndarray], selected: Sequence[str]) -> Optional[np.ndarray]:
+        """Campaigns in any of the selected options, or None when nothing is selected"""
+        masks = [bitsets[name] for name in selected if name in bitsets]
+        if not selected:
+            return None
+        if not masks:
+            return np.zeros(len(self), dtype=bool)
+        return np.logical_or.reduce(masks) if len(masks) > 1 else masks[0]
+
+    def _intersect(self, *masks: Optional[np.ndarray]) -> np.ndarray:
+        result = np.ones(len(self), dtype=bool)
+        for mask in masks:
+            if mask is not None:
+                result &= mask
+        return result
+
+    def query(self, filters: FacetFilters) -> FacetResult:
+        """The campaigns matching every filter, with live counts for each facet's options"""
+        category_mask = self._union(self.category_bitsets, filters.categories)
+        funding_mask = self._union(self.funding_bitsets, filters.funding)
+        verified_mask = None
+        if filters.verified == "Verified":
+            verified_mask = self.verified
+        elif filters.verified == "Under review":
+            verified_mask = ~self.verified
+        target_mask = None
+        if filters.target_range is not None:
+            low, high = filters.target_range
+            target_mask = (self.target >= low) & (self.target <= high)
+
+        # Each facet is counted under every filter but its own, so its options show
+        # how many campaigns choosing them would give
+        without_category = self._intersect(verified_mask, funding_mask, target_mask)
+        without_verified = self._intersect(category_mask, funding_mask, target_mask)
+        without_funding = self._intersect(category_mask, verified_mask, target_mask)
+        verified_total = int(np.count_nonzero(without_verified))
+        verified_count = int(np.count_nonzero(without_verified & self.verified))
+
+        mask = without_category if category_mask is None else without_category & category_mask
+        return FacetResult(
+            mask=mask,
+            total=int(np.count_nonzero(mask)),
+            category_counts={
+                name: int(np.count_nonzero(bitset & without_category)) for name, bitset in self.category_bitsets.items()
+            },
+            verified_counts={
+                "All": verified_total,
+                "Verified": verified_count,
+                "Under review": verified_total - verified_count,
+            },
+            funding_counts={
+                label: int(np.count_nonzero(bitset & without_funding)) for label, bitset in self.funding_bitsets.items()
+            },
+        )
+
+    def iter_campaigns(self, mask: np.ndarray, sort: str = SORTS[0]) -> Iterator[Dict]:
+        """The campaigns selected by `mask` in `sort` order, read off the permutation lazily"""
+        order = self.orders.get(sort, self.orders[SORTS[0]])
+        campaigns = self.campaigns
+        for start in range(0, len(order), ITER_CHUNK):
+            chunk = order[start:start + ITER_CHUNK]
+            for position in chunk[mask[chunk]].tolist():
+                yield campaigns[position]
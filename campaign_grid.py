@@ -0,0 +1,93 @@
+"""
+HAVEN Crowdfunding Platform - Campaign Grid
+Incrementally mounted card grid shared by the Browse, Explore and Search pages
+"""
+
+import itertools
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+import streamlit as st
+from streamlit_card import card
+from streamlit_extras.badges import badge
+
+from image_cache import campaign_image
+from telemetry import span
+
+COLUMNS = 3
+ROWS_PER_BATCH = 4
+
+
+def goal_text(campaign: Dict) -> str:
+    return f"Goal: ${campaign['target_amount']:,}"
+
+
+def raised_text(campaign: Dict) -> str:
+    return f"Raised: ${campaign['current_amount']:,} of ${campaign['target_amount']:,}"
+
+
+def _show_more_rows(state_key: str, rows: int):
+    st.session_state[state_key]["rows"] += rows
+
+
+def _render_card(campaign: Dict, key: str, card_text: Callable[[Dict], str], show_status: bool):
+    # Keys are derived from the campaign id, so a card keeps its mounted iframe
+    # across reruns and when more rows are loaded below it.
+    if show_status:
+        # Display a verification status badge based on the workflow
+        if campaign['verified']:
+            badge(type="success", label="Verified")
+        else:
+            badge(type="warning", label="Under Review")
+    clicked = card(
+        title=campaign['title'],
+        text=card_text(campaign),
+        image=campaign_image(campaign, "card"),
+        key=f"{key}_card_{campaign['id']}"
+    )
+    if clicked:
+        # Navigate within this session: a URL would open a new page load, which
+        # starts a new session that is not signed in
+        st.query_params["campaign"] = str(campaign['id'])
+        st.rerun()
+
+
+def render_campaign_grid(
+    campaigns: Iterable[Dict],
+    key: str,
+    card_text: Callable[[Dict], str] = goal_text,
+    show_status: bool = False,
+    total: Optional[int] = None,
+    reset_on: Hashable = None,
+    rows_per_batch: int = ROWS_PER_BATCH,
+):
+    """Render campaigns as a grid, mounting only the rows revealed so far.
+
+    `campaigns` may be a lazy iterator such as utils.iter_campaigns(); only as
+    many items as are visible are pulled from it. `total` is the number of
+    campaigns available (taken from len() when omitted, if possible) and decides
+    whether "Load more" is shown. Changing `reset_on`, e.g. a search query,
+    collapses the grid back to its first batch.
+    """
+    state_key = f"{key}_grid"
+    state = st.session_state.get(state_key)
+    if state is None or state["reset_on"] != reset_on:
+        state = st.session_state[state_key] = {"rows": rows_per_batch, "reset_on": reset_on}
+
+    if total is None and hasattr(campaigns, "__len__"):
+        total = len(campaigns)
+    visible_count = state["rows"] * COLUMNS
+    # Without a known total, pull one extra campaign to learn whether there are more
+    visible = list(itertools.islice(campaigns, visible_count if total is not None else visible_count + 1))
+    has_more = len(visible) > visible_count if total is None else visible_count < total
+    visible = visible[:visible_count]
+
+    # Row-major layout: loading more appends rows and leaves existing ones untouched
+    with span("campaign_grid", grid=key):
+        for row_start in range(0, len(visible), COLUMNS):
+            cols = st.columns(COLUMNS)
+            for col, campaign in zip(cols, visible[row_start:row_start + COLUMNS]):
+                with col:
+                    _render_card(campaign, key, card_text, show_status)
+
+    if has_more:
+        st.button("Load more", key=f"{key}_load_more", on_click=_show_more_rows, args=(state_key, rows_per_batch))
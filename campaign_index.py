@@ -0,0 +1,130 @@
+"""
+HAVEN Crowdfunding Platform - Campaign Lookup Index
+Lookups over the catalogue by id, slug, category and verification status
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from campaign_record import CampaignRecord
+
+
+def slugify(title: str) -> str:
+    """Turn a campaign title into a URL-safe slug"""
+    return re.sub(r"[^\w]+", "-", title.lower()).strip("-")
+
+
+def campaign_slug(campaign: Dict) -> str:
+    """Deep-link slug of a campaign: its slugified title followed by its id.
+
+    Titles are not unique, so the id makes every slug unique and the same
+    whatever order campaigns were loaded in.
+    """
+    title = slugify(campaign["title"])
+    return f"{title}-{campaign['id']}" if title else str(campaign["id"])
+
+
+class CampaignIndex:
+    """O(1) campaign lookups over the catalogue, shared read-only and updated in place as it changes"""
+
+    def __init__(self, campaigns: Iterable[Dict] = (), version: str = ""):
+        self.version = version
+        self.by_id: Dict[int, Dict] = {}
+        self.by_slug: Dict[str, Dict] = {}
+        self.by_category: Dict[str, Dict[int, Dict]] = {}
+        self.by_verified: Dict[bool, Dict[int, Dict]] = {True: {}, False: {}}
+        self._slugs: Dict[int, str] = {}
+        self._snapshot: Optional[List[Dict]] = None
+        self._ids: Optional[Tuple[int, ...]] = None
+        self._lock = threading.RLock()
+        self.apply(campaigns)
+
+    def apply(self, upserted: Iterable[Dict] = (), removed_ids: Iterable[int] = (), version: str = None):
+        """Add or replace campaigns and drop removed ones, touching only their entries"""
+        with self._lock:
+            for campaign_id in removed_ids:
+                old = self.by_id.pop(campaign_id, None)
+                if old is not None:
+                    self._unlink(old)
+            for campaign in upserted:
+                campaign = CampaignRecord.from_mapping(campaign)
+                old = self.by_id.get(campaign["id"])
+                if old is not None:
+                    self._unlink(old)
+                # Replacing a key keeps the campaign's position in catalogue order
+                self.by_id[campaign["id"]] = campaign
+                self._link(campaign)
+            if version is not None:
+                self.version = version
+            self._snapshot = None
+            self._ids = None
+
+    def _link(self, campaign: Dict):
+        slug = campaign_slug(campaign)
+        self.by_slug[slug] = campaign
+        self._slugs[campaign["id"]] = slug
+
+        self.by_category.setdefault(campaign["category"], {})[campaign["id"]] = campaign
+        self.by_verified[bool(campaign["verified"])][campaign["id"]] = campaign
+
+    def _unlink(self, campaign: Dict):
+        self.by_slug.pop(self._slugs.pop(campaign["id"], None), None)
+        category = self.by_category.get(campaign["category"], {})
+        category.pop(campaign["id"], None)
+        if not category:
+            self.by_category.pop(campaign["category"], None)
+        self.by_verified[bool(campaign["verified"])].pop(campaign["id"], None)
+
+    @property
+    def campaigns(self) -> List[Dict]:
+        """All campaigns in catalogue order; the list is rebuilt only after a change"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot = list(self.by_id.values())
+        return snapshot
+
+    @property
+    def ids(self) -> Tuple[int, ...]:
+        """All campaign ids in catalogue order; like `campaigns`, rebuilt only after a change"""
+        ids = self._ids
+        if ids is None:
+            with self._lock:
+                ids = self._ids = tuple(self.by_id)
+        return ids
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, campaign_id: int) -> Optional[Dict]:
+        """Look up a campaign by id"""
+        return self.by_id.get(campaign_id)
+
+    def get_by_slug(self, slug: str) -> Optional[Dict]:
+        """Look up a campaign by its slug"""
+        return self.by_slug.get(slug)
+
+    def resolve(self, reference: str) -> Optional[Dict]:
+        """Look up a campaign from a deep-link reference, either its id or its slug.
+
+        Slugs end in the campaign id, which is what resolves them; the title
+        part is cosmetic, so links keep working after a campaign is renamed.
+        """
+        campaign_id = str(reference).strip().rpartition("-")[2]
+        return self.get(int(campaign_id)) if campaign_id.isdigit() else None
+
+    def in_category(self, category: str) -> List[Dict]:
+        """All campaigns in a category"""
+        with self._lock:
+            return list(self.by_category.get(category, {}).values())
+
+    def with_verified(self, verified: bool = True) -> List[Dict]:
+        """All campaigns with the given verification status"""
+        with self._lock:
+            return list(self.by_verified[verified].values())
+
+    def title_for(self, campaign_id: int) -> str:
+        """Display title of a campaign, suitable as a selectbox format_func"""
+        campaign = self.by_id.get(campaign_id)
+        return campaign["title"] if campaign else str(campaign_id)
@@ -0,0 +1,105 @@
+"""
+HAVEN Crowdfunding Platform - Campaign Records
+Compact, read-only campaign records shared by every session instead of per-campaign dicts
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+# Fields the backend returns for every campaign, in catalogue order
+FIELDS = (
+    "id", "title", "image", "current_amount", "target_amount",
+    "donors_count", "category", "verified", "description",
+)
+
+# Low-cardinality strings stored once per process however many campaigns repeat them
+INTERNED_FIELDS = ("category", "image")
+
+
+class CampaignRecord(Mapping):
+    """One campaign, read like the backend's dict but stored in slots.
+
+    A slotted record has no per-instance ``__dict__`` or hash table, so a large
+    catalogue costs a fraction of the memory of the equivalent dicts, and
+    repeated categories and image URLs share one interned string. Records are
+    immutable: a changed campaign arrives as a new record in a catalogue delta,
+    so the catalogue can be shared across sessions without copying it. Fields
+    the backend omits are absent (``record.get(...)`` returns the default);
+    unknown fields are kept in a small side dict.
+    """
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, fields: Mapping):
+        extra = None
+        for key, value in fields.items():
+            if key in _FIELD_SET:
+                if key in INTERNED_FIELDS and isinstance(value, str):
+                    value = sys.intern(value)
+                object.__setattr__(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(self, "_extra", extra)
+
+    @classmethod
+    def from_mapping(cls, campaign: Mapping) -> "CampaignRecord":
+        """The campaign as a record; records are returned as they are"""
+        return campaign if isinstance(campaign, cls) else cls(campaign)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("campaign records are read-only")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("campaign records are read-only")
+
+    def __reduce__(self):
+        present = tuple(key for key in FIELDS if hasattr(self, key))
+        # A fully populated record pickles FIELDS itself, which the pickler memoizes across records
+        return _restore, (FIELDS if len(present) == len(FIELDS) else present,
+                          tuple(getattr(self, key) for key in present), self._extra)
+
+    def __repr__(self) -> str:
+        return f"CampaignRecord(id={self.get('id')!r}, title={self.get('title')!r})"
+
+    def replace(self, **changes) -> "CampaignRecord":
+        """A copy of the record with some fields changed"""
+        return type(self)({**self.to_dict(), **changes})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict of the record, e.g. for JSON"""
+        return dict(self.items())
+
+
+_FIELD_SET = frozenset(FIELDS)
+
+
+def _restore(fields, values, extra) -> CampaignRecord:
+    """Unpickles a record without re-checking or re-interning its fields"""
+    record = object.__new__(CampaignRecord)
+    for key, value in zip(fields, values):
+        object.__setattr__(record, key, value)
+    object.__setattr__(record, "_extra", extra)
+    return record
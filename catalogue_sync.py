@@ -0,0 +1,298 @@
+"""
+HAVEN Crowdfunding Platform - Catalogue Sync
+Process-wide campaign catalogue kept current with conditional requests and version deltas
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import requests
+
+from campaign_index import CampaignIndex
+from campaign_record import CampaignRecord
+from search_index import SearchIndex
+from telemetry import count, span
+
+CATALOGUE_PATH = "/api/campaigns"
+CHANGES_PATH = "/api/campaigns/changes"
+
+# Page size used when downloading the whole catalogue
+FULL_SYNC_PAGE_SIZE = 500
+
+# Version reported while serving the built-in fallback catalogue
+FALLBACK_VERSION = "mock"
+
+# Version reported while only the first page is loaded and the full sync is under way
+PARTIAL_VERSION = "partial"
+
+# Seconds between attempts to finish a partial catalogue when periodic syncing is off
+PARTIAL_RETRY_SECONDS = 30
+
+# Fields the campaign index needs; a delta with a campaign missing one is rejected whole
+REQUIRED_FIELDS = ("id", "title", "category", "verified")
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogueDelta(NamedTuple):
+    """Campaigns added or changed, and ids removed, on the way to `version`"""
+    version: str
+    upserted: List[Dict]
+    removed: List[int]
+
+
+class CatalogueStore:
+    """The campaign catalogue and its derived indexes, shared by every session of the process.
+
+    `load_first_page` serves the first page at once and `start` downloads the
+    rest in the background, page by page; later syncs ask the backend only
+    for what changed since the version held (`GET
+    /api/campaigns/changes?since=<version>`), revalidating with If-None-Match
+    and If-Modified-Since so an unchanged catalogue costs a 304. Deltas are
+    applied in place to the campaign and search indexes, then handed to the
+    registered listeners, with campaigns as shared `CampaignRecord`s. Backends
+    without the changes endpoint are revalidated by comparing the version on
+    the first catalogue page instead.
+    """
+
+    def __init__(self, client, fallback: Iterable[Dict] = ()):
+        self.client = client
+        self.fallback = list(fallback)
+        self.index = CampaignIndex()
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        # Validators of the first catalogue page, for revalidating full syncs
+        self.page_etag: Optional[str] = None
+        self.page_last_modified: Optional[str] = None
+        self.supports_deltas = True
+        self._search_index: Optional[SearchIndex] = None
+        self._listeners: List[Callable[[CatalogueDelta], None]] = []
+        # Serialises syncs; readers never take it
+        self._sync_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    @property
+    def version(self) -> str:
+        return self.index.version
+
+    @property
+    def campaigns(self) -> List[Dict]:
+        return self.index.campaigns
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Full-text index over the catalogue, built on first use and then kept current by deltas"""
+        if self._search_index is None:
+            with self._sync_lock:
+                if self._search_index is None:
+                    self._search_index = SearchIndex(self.index.campaigns)
+        return self._search_index
+
+    def add_listener(self, listener: Callable[[CatalogueDelta], None]):
+        """Call `listener` with every delta applied from now on"""
+        self._listeners.append(listener)
+
+    def page(self, offset: int = 0, limit: int = 12) -> Dict:
+        """One page of the catalogue, shaped like the backend's /api/campaigns response"""
+        campaigns = self.index.campaigns
+        items = campaigns[offset:offset + limit]
+        next_offset = offset + len(items)
+        return {
+            "items": items,
+            "total": len(campaigns),
+            "version": self.version,
+            "next_offset": next_offset if items and next_offset < len(campaigns) else None,
+        }
+
+    def load_first_page(self, limit: int) -> bool:
+        """Load only the catalogue's first page, so pages render while start() downloads the rest"""
+        with self._sync_lock:
+            if self.version:
+                return False
+            try:
+                with span("catalogue_sync", mode="first_page"):
+                    response = self.client.get(CATALOGUE_PATH, params={"offset": 0, "limit": limit})
+                    response.raise_for_status()
+                    self._apply(CatalogueDelta(PARTIAL_VERSION, response.json()["items"], []))
+            except (requests.exceptions.RequestException, ValueError, KeyError, TypeError):
+                count("catalogue_sync", result="error")
+                if self.fallback:
+                    self._apply(CatalogueDelta(FALLBACK_VERSION, self.fallback, []))
+                return False
+            return True
+
+    def sync(self) -> bool:
+        """Bring the catalogue up to date; returns whether anything changed.
+
+        Network and payload errors leave the current catalogue in place.
+        """
+        with self._sync_lock:
+            try:
+                if self.version in ("", FALLBACK_VERSION, PARTIAL_VERSION) or not self.supports_deltas:
+                    return self._full_sync()
+                return self._pull_changes()
+            except (requests.exceptions.RequestException, ValueError, KeyError, TypeError):
+                count("catalogue_sync", result="error")
+                if not self.version and self.fallback:
+                    self._apply(CatalogueDelta(FALLBACK_VERSION, self.fallback, []))
+                return False
+
+    def _full_sync(self) -> bool:
+        """Download the catalogue, unless the backend says it has not changed.
+
+        The first page is revalidated with the validators of the last full
+        sync. Without a `version` in the response, the catalogue's version is a
+        hash of its content, so changed totals and edits are always picked up.
+        """
+        headers = {}
+        if self.version not in ("", FALLBACK_VERSION, PARTIAL_VERSION):
+            if self.page_etag:
+                headers["If-None-Match"] = self.page_etag
+            if self.page_last_modified:
+                headers["If-Modified-Since"] = self.page_last_modified
+
+        with span("catalogue_sync", mode="full"):
+            items: List[Dict] = []
+            offset, version = 0, None
+            while True:
+                response = self.client.get(
+                    CATALOGUE_PATH, params={"offset": offset, "limit": FULL_SYNC_PAGE_SIZE},
+                    headers=headers if offset == 0 else None,
+                )
+                if offset == 0 and response.status_code == 304:
+                    count("catalogue_sync", result="not_modified")
+                    return False
+                response.raise_for_status()
+                data = response.json()
+                if offset == 0:
+                    page_etag = response.headers.get("ETag")
+                    page_last_modified = response.headers.get("Last-Modified")
+                    version = str(data["version"]) if data.get("version") is not None else None
+                    if version is not None and version == self.version:
+                        count("catalogue_sync", result="not_modified")
+                        return False
+                items.extend(data["items"])
+                offset += len(data["items"])
+                if not data["items"] or offset >= data["total"]:
+                    break
+
+            if version is None:
+                version = "sha1:" + hashlib.sha1(
+                    json.dumps(items, sort_keys=True, default=str).encode("utf-8")
+                ).hexdigest()
+            self.page_etag, self.page_last_modified = page_etag, page_last_modified
+            if version == self.version:
+                count("catalogue_sync", result="not_modified")
+                return False
+
+            fetched_ids = {campaign["id"] for campaign in items}
+            removed = [campaign_id for campaign_id in self.index.by_id if campaign_id not in fetched_ids]
+            self.etag = self.last_modified = None
+            self._apply(CatalogueDelta(version, items, removed))
+            count("catalogue_sync", result="full")
+            return True
+
+    def _pull_changes(self) -> bool:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        with span("catalogue_sync", mode="delta"):
+            response = self.client.get(CHANGES_PATH, params={"since": self.version}, headers=headers)
+            if response.status_code == 304:
+                count("catalogue_sync", result="not_modified")
+                return False
+            if response.status_code in (404, 405):
+                self.supports_deltas = False
+                return self._full_sync()
+            if response.status_code == 410:
+                # Our version is older than the backend's change log reaches back
+                return self._full_sync()
+            response.raise_for_status()
+            data = response.json()
+
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+            delta = CatalogueDelta(str(data["version"]), data.get("upserted", []), data.get("removed", []))
+            if delta.version == self.version:
+                count("catalogue_sync", result="not_modified")
+                return False
+            self._apply(delta)
+            count("catalogue_sync", result="delta")
+            return True
+
+    @staticmethod
+    def _validated(delta: CatalogueDelta) -> CatalogueDelta:
+        """The delta with its campaigns as records, checked before any of it is applied.
+
+        Converted once here so the indexes and listeners all share the same
+        read-only records. Raises TypeError or KeyError for a malformed delta.
+        """
+        if not isinstance(delta.upserted, list) or not isinstance(delta.removed, list):
+            raise TypeError("catalogue delta needs 'upserted' and 'removed' lists")
+        upserted = []
+        for campaign in delta.upserted:
+            if not isinstance(campaign, Mapping):
+                raise TypeError(f"catalogue delta campaign is a {type(campaign).__name__}, not a mapping")
+            record = CampaignRecord.from_mapping(campaign)
+            for field in REQUIRED_FIELDS:
+                record[field]
+            upserted.append(record)
+        return delta._replace(upserted=upserted, removed=[int(campaign_id) for campaign_id in delta.removed])
+
+    def _apply(self, delta: CatalogueDelta):
+        delta = self._validated(delta)
+        try:
+            self.index.apply(delta.upserted, delta.removed, delta.version)
+        except Exception:
+            # Part-applied: the next sync downloads the whole catalogue again
+            # and the search index is rebuilt from it
+            self.index.version = ""
+            self._search_index = None
+            raise
+        if self._search_index is not None:
+            try:
+                self._search_index.update(delta.upserted, delta.removed)
+            except Exception:
+                # Rebuilt from the campaign index the next time it is used
+                logger.exception("Search index update failed; rebuilding it")
+                self._search_index = None
+        for listener in list(self._listeners):
+            try:
+                listener(delta)
+            except Exception:
+                logger.exception("Catalogue listener %r failed", listener)
+
+    def start(self, interval: float) -> "CatalogueStore":
+        """Sync on a daemon thread: at once if only the first page is loaded, then every
+        `interval` seconds (0 disables periodic syncing once the catalogue is complete)"""
+        if (interval and interval > 0) or self.version == PARTIAL_VERSION:
+            threading.Thread(
+                target=self._sync_loop, args=(interval,), name="haven-catalogue-sync", daemon=True
+            ).start()
+        return self
+
+    def _sync_loop(self, interval: float):
+        wait = 0 if self.version == PARTIAL_VERSION else interval
+        while not self._stop.wait(wait):
+            try:
+                self.sync()
+            except Exception:
+                # Never let one bad sync end the thread and leave the catalogue stale
+                logger.exception("Catalogue sync failed")
+                count("catalogue_sync", result="error")
+            if interval and interval > 0:
+                wait = interval
+            elif self.version == PARTIAL_VERSION:
+                wait = PARTIAL_RETRY_SECONDS
+            else:
+                return
+
+    def close(self):
+        self._stop.set()
@@ -0,0 +1,275 @@
+"""
+HAVEN Crowdfunding Platform - Contributions
+Background contribution pipeline with idempotency keys, so payments never block
+a script thread and a repeated submission is never charged twice
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import requests
+import streamlit as st
+from streamlit_notify import notify
+
+from live_totals import get_funding_totals
+from profile_data import invalidate_profile
+from session_store import current_token, current_user_id, decode_claims
+from telemetry import count, span
+from ttl_cache import TTLCache
+from utils import BACKEND_URL, get_backend_client, get_setting
+
+CONTRIBUTIONS_PATH = "/api/contributions"
+
+PENDING, CONFIRMED, FAILED = "pending", "confirmed", "failed"
+
+# Seconds between status redraws while one of the session's contributions is pending
+STATUS_REFRESH_SECONDS = 1
+
+# 4xx statuses that are not a decision on the payment (auth, a concurrent
+# request with the same key, a rate limit left after retries): the same key may be retried
+NOT_DECLINED_STATUSES = (401, 408, 409, 429)
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentDeclined(Exception):
+    """The backend refused the contribution, e.g. the card was declined"""
+
+
+class Contribution:
+    """One contribution and where it is in the pipeline"""
+
+    __slots__ = (
+        "idempotency_key", "campaign_id", "amount", "token",
+        "status", "message", "result", "submitted_at", "completed_at", "retryable",
+    )
+
+    def __init__(self, idempotency_key: str, campaign_id: int, amount: float, token: Optional[str]):
+        self.idempotency_key = idempotency_key
+        self.campaign_id = campaign_id
+        self.amount = amount
+        self.token = token
+        self.status = PENDING
+        self.message = ""
+        self.result: Dict = {}
+        self.submitted_at = time.time()
+        self.completed_at: Optional[float] = None
+        # Whether a failure may be retried with the same idempotency key; a
+        # declined payment is settled, so its key would only replay the decline
+        self.retryable = True
+
+
+class ContributionQueue:
+    """Bounded queue of contributions processed by a pool of daemon workers.
+
+    `submit` only records and enqueues, so it returns immediately. Records are
+    keyed by idempotency key: submitting a key that is pending or confirmed
+    returns the existing record, and only a failed one is sent again, with the
+    same key, so the payment backend can deduplicate it too.
+    """
+
+    def __init__(
+        self,
+        processor: Callable[[Contribution], Dict],
+        workers: int = 4,
+        max_pending: int = 1000,
+        on_confirmed: Callable[[Contribution], None] = None,
+        retention: float = 3600,
+    ):
+        self.processor = processor
+        self.on_confirmed = on_confirmed
+        self.records = TTLCache(max_entries=max(10 * max_pending, 10000), ttl=retention)
+        self._queue: "queue.Queue[Contribution]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        for number in range(workers):
+            threading.Thread(target=self._work, name=f"haven-contributions-{number}", daemon=True).start()
+
+    def submit(self, idempotency_key: str, campaign_id: int, amount: float, token: str = None) -> Contribution:
+        with self._lock:
+            record = self.records.get(idempotency_key)
+            if record is not None and record.status != FAILED:
+                count("contributions", result="duplicate")
+                return record
+            record = Contribution(idempotency_key, campaign_id, amount, token)
+            self.records.set(idempotency_key, record)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._finish(record, FAILED, "We are handling a lot of contributions right now. Please try again shortly.")
+        return record
+
+    def get(self, idempotency_key: str) -> Optional[Contribution]:
+        return self.records.get(idempotency_key)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _finish(self, record: Contribution, status: str, message: str, result: Dict = None):
+        record.result = result or {}
+        record.message = message
+        record.completed_at = time.time()
+        # Status last: readers polling it then see a complete record
+        record.status = status
+        count("contributions", result=status)
+
+    def _work(self):
+        while True:
+            record = self._queue.get()
+            try:
+                with span("contribution_processing"):
+                    result = self.processor(record)
+            except PaymentDeclined as err:
+                record.retryable = False
+                self._finish(record, FAILED, str(err))
+            except (requests.exceptions.RequestException, ValueError):
+                self._finish(record, FAILED, "We could not confirm your contribution. Please try again; you will not be charged twice.")
+            except Exception:
+                # Never leave the record pending or let the error end the worker
+                logger.exception("Contribution %s failed unexpectedly", record.idempotency_key)
+                self._finish(record, FAILED, "We could not confirm your contribution. Please try again; you will not be charged twice.")
+            else:
+                self._finish(record, CONFIRMED, "", result)
+                if self.on_confirmed is not None:
+                    try:
+                        self.on_confirmed(record)
+                    except Exception:
+                        logger.exception("Confirmed contribution %s could not be published", record.idempotency_key)
+            finally:
+                self._queue.task_done()
+
+
+def _post_contribution(record: Contribution) -> Dict:
+    """Send a contribution to the backend; safe to retry thanks to its idempotency key"""
+    headers = {"Idempotency-Key": record.idempotency_key}
+    if record.token:
+        headers["Authorization"] = f"Bearer {record.token}"
+    response = get_backend_client(BACKEND_URL).post(
+        CONTRIBUTIONS_PATH,
+        json={"campaign_id": record.campaign_id, "amount": record.amount},
+        headers=headers,
+        idempotent=True,
+    )
+    if 400 <= response.status_code < 500 and response.status_code not in NOT_DECLINED_STATUSES:
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        detail = body.get("detail") if isinstance(body, dict) else None
+        raise PaymentDeclined(str(detail) if detail else "Your contribution could not be processed.")
+    response.raise_for_status()
+    return response.json()
+
+
+def _publish_total(record: Contribution):
+    # Show the new total to every viewer at once rather than waiting for the event stream
+    if "current_amount" in record.result:
+        get_funding_totals().update(record.campaign_id, record.result["current_amount"], record.result.get("donors_count"))
+
+
+def _on_confirmed(record: Contribution):
+    _publish_total(record)
+    # The contributor's donation history changed, even if they are not looking at the panel
+    subject = decode_claims(record.token).get("sub") if record.token else None
+    if subject is not None:
+        invalidate_profile(str(subject))
+
+
+@st.cache_resource
+def get_contribution_queue() -> ContributionQueue:
+    """Process-wide contribution pipeline with [performance] contribution_workers workers"""
+    return ContributionQueue(
+        _post_contribution,
+        workers=get_setting("performance", "contribution_workers", 4),
+        on_confirmed=_on_confirmed,
+    )
+
+
+def _form_key(campaign_id: int) -> str:
+    """Idempotency key of the contribution form currently shown for a campaign.
+
+    It stays the same until that contribution is confirmed or declined, so
+    double clicks and resubmissions after a transport failure reuse it, while
+    a declined payment, which the backend remembers per key, is never replayed.
+    """
+    keys = st.session_state.setdefault("contribution_keys", {})
+    record = get_contribution_queue().get(keys[campaign_id]) if campaign_id in keys else None
+    if campaign_id not in keys or (record is not None and record.status == FAILED and not record.retryable):
+        keys[campaign_id] = str(uuid.uuid4())
+    return keys[campaign_id]
+
+
+def _session_contributions(campaign_id: int) -> List[str]:
+    return st.session_state.setdefault("contributions", {}).setdefault(campaign_id, [])
+
+
+def _render_contribution_status(campaign: Dict):
+    pipeline = get_contribution_queue()
+    submitted = _session_contributions(campaign["id"])
+    notified = st.session_state.setdefault("contributions_notified", set())
+    keys = st.session_state.setdefault("contribution_keys", {})
+    for key in reversed(submitted[-5:]):
+        record = pipeline.get(key)
+        if record is None:
+            continue
+        if record.status == PENDING:
+            st.info(f"⏳ Processing your ${record.amount:,} contribution…")
+        elif record.status == FAILED:
+            st.error(f"Your ${record.amount:,} contribution failed: {record.message}")
+        else:
+            st.success(f"✓ Your ${record.amount:,} contribution is confirmed.")
+            if key not in notified:
+                notified.add(key)
+                # The next contribution to this campaign gets a fresh idempotency key
+                if keys.get(campaign["id"]) == key:
+                    keys.pop(campaign["id"])
+                invalidate_profile(current_user_id())
+                st.session_state.pop("profile_donations_offset", None)
+                notify(f"Thank you for your ${record.amount} contribution!", "success")
+
+
+def _has_pending(campaign_id: int) -> bool:
+    pipeline = get_contribution_queue()
+    return any(
+        record is not None and record.status == PENDING
+        for record in map(pipeline.get, _session_contributions(campaign_id)[-5:])
+    )
+
+
+@st.fragment(run_every=STATUS_REFRESH_SECONDS)
+def _poll_contribution_status(campaign: Dict):
+    """Status redrawn every second; only rendered while a contribution is pending"""
+    _render_contribution_status(campaign)
+    if not _has_pending(campaign["id"]):
+        # Rerun the page once so the panel stops polling and the new total shows
+        st.rerun()
+
+
+@st.fragment
+def render_contribution_panel(campaign: Dict):
+    """Contribution form and the status of this session's contributions to the campaign.
+
+    Runs as a fragment: submitting only reruns this panel and never waits on
+    the payment itself. The status polls for updates only while one of the
+    session's contributions to the campaign is still pending.
+    """
+    pipeline = get_contribution_queue()
+    submitted = _session_contributions(campaign["id"])
+
+    with st.form("contribution_form"):
+        amount = st.number_input("Enter your contribution amount", min_value=5)
+        if st.form_submit_button("Contribute Now"):
+            key = _form_key(campaign["id"])
+            record = pipeline.submit(key, campaign["id"], amount, current_token())
+            if key not in submitted:
+                submitted.append(key)
+            if record.amount != amount:
+                st.info(f"Your ${record.amount:,} contribution is still being processed.")
+
+    if _has_pending(campaign["id"]):
+        _poll_contribution_status(campaign)
+    else:
+        _render_contribution_status(campaign)
@@ -1,23 +1,66 @@
 import streamlit as st
-from utils import get_all_campaigns
-from streamlit_card import card
+from utils import get_campaign_facets, get_catalogue_version
+from campaign_grid import render_campaign_grid, goal_text
+from campaign_facets import FUNDING_BUCKETS, SORTS, VERIFIED_OPTIONS, FacetFilters
+
+def _current_filters(target_bounds):
+    """The filters as last set by the widgets below, read before drawing them so their options can show counts."""
+    state = st.session_state
+    target_range = state.get("explore_target")
+    if target_range is not None and not (target_bounds[0] <= target_range[0] <= target_range[1] <= target_bounds[1]):
+        # The catalogue's range moved past the selection; start over from the full range
+        del state["explore_target"]
+        target_range = None
+    if target_range is not None and tuple(target_range) == target_bounds:
+        target_range = None
+    return FacetFilters(
+        categories=tuple(state.get("explore_categories", ())),
+        verified=state.get("explore_verified", "All"),
+        funding=tuple(state.get("explore_funding", ())),
+        target_range=tuple(target_range) if target_range is not None else None,
+    )
 
 def show():
     st.header("Explore All Campaigns")
-    # This section can be expanded in the future with filters for category, location, etc.
-    
-    all_campaigns = get_all_campaigns()
-    if not all_campaigns:
+
+    facets = get_campaign_facets(get_catalogue_version())
+    if not len(facets):
         st.info("No campaigns are available at the moment.")
         return
-    
-    # Create a responsive 3-column grid for displaying campaigns
-    cols = st.columns(3)
-    for i, campaign in enumerate(all_campaigns):
-        with cols[i % 3]:
-            card(
-                title=campaign['title'], 
-                text=f"Goal: ${campaign['target_amount']:,}", 
-                image=campaign['image'], 
-                url="#" # This would link to the campaign detail page
+
+    target_bounds = facets.target_bounds
+    filters = _current_filters(target_bounds)
+    result = facets.query(filters)
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        st.multiselect(
+            "Category", facets.categories, key="explore_categories",
+            format_func=lambda name: f"{name} ({result.category_counts[name]:,})",
+        )
+        st.multiselect(
+            "Funded", [label for label, _, _ in FUNDING_BUCKETS], key="explore_funding",
+            format_func=lambda label: f"{label} ({result.funding_counts[label]:,})",
+        )
+    with col2:
+        st.radio(
+            "Status", VERIFIED_OPTIONS, key="explore_verified", horizontal=True,
+            format_func=lambda option: f"{option} ({result.verified_counts[option]:,})",
+        )
+        if target_bounds[0] < target_bounds[1]:
+            st.slider(
+                "Target amount ($)", min_value=target_bounds[0], max_value=target_bounds[1],
+                value=target_bounds, key="explore_target",
             )
+    with col3:
+        sort = st.selectbox("Sort by", SORTS, key="explore_sort")
+
+    if not result.total:
+        st.info("No campaigns match these filters.")
+        return
+
+    st.caption(f"{result.total:,} campaigns")
+    render_campaign_grid(
+        facets.iter_campaigns(result.mask, sort), key="explore", card_text=goal_text,
+        total=result.total, reset_on=(filters, sort),
+    )
@@ -0,0 +1,58 @@
+"""
+HAVEN Crowdfunding Platform - Glossary Simplifier
+Expands glossary terms in a single pass using one compiled, trie-factored regular expression
+"""
+
+import re
+from typing import Dict, Optional
+
+
+def _trie_pattern(terms) -> str:
+    """Build a regex alternation factored on common prefixes.
+
+    'sustain', 'sustainability' and 'support' become s(?:u(?:stain(?:ability)?|pport)),
+    so matching walks the trie instead of trying every term at every position.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        is_terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_terminal:
+            # Greedy optional: prefer the longer term, fall back to the shorter one
+            return body + "?" if len(branches) == 1 and len(body) == 1 else "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class Glossary:
+    """Compiled glossary for one language; simplify() runs in a single pass over the text"""
+
+    def __init__(self, terms: Dict[str, str]):
+        self.terms = {term.lower(): explanation for term, explanation in terms.items()}
+        self.pattern: Optional[re.Pattern] = None
+        if self.terms:
+            # Lookarounds rather than \b, so terms may start or end with punctuation
+            self.pattern = re.compile(r"(?<!\w)(?:" + _trie_pattern(self.terms) + r")(?!\w)", re.IGNORECASE)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _expand(self, match: re.Match) -> str:
+        term = match.group(0)
+        return f"**{term}** (*{self.terms[term.lower()]}*)"
+
+    def simplify(self, text: str) -> str:
+        """Follow each whole-word glossary term in text with its plain-language explanation"""
+        if not text or self.pattern is None:
+            return text
+        return self.pattern.sub(self._expand, text)
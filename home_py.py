@@ -8,33 +8,17 @@ Original file is located at
 """
 
 import streamlit as st
-from utils import get_all_campaigns, render_logo
-from streamlit_card import card
-from streamlit_extras.badges import badge
+from utils import get_campaign_page, iter_campaigns, render_logo
+from campaign_grid import render_campaign_grid, raised_text
 
 def show():
     render_logo()
     st.header("Browse Campaigns")
 
-    all_campaigns = get_all_campaigns()
-    if not all_campaigns:
+    total = get_campaign_page(0)["total"]
+    if not total:
         st.info("No campaigns found.")
         return
 
-    # Create a responsive 3-column grid for the campaigns
-    cols = st.columns(3)
-    for i, campaign in enumerate(all_campaigns):
-        with cols[i % 3]:
-            # Display a verification status badge based on the workflow
-            if campaign['verified']:
-                badge(type="success", label="Verified")
-            else:
-                badge(type="warning", label="Under Review")
-
-            # Display the campaign information using a card
-            card(
-                title=campaign['title'],
-                text=f"Raised: ${campaign['current_amount']:,} of ${campaign['target_amount']:,}",
-                image=campaign['image'],
-                url="#" # In a real app, this would link to the specific campaign page
-            )
\ No newline at end of file
+    # Cards show their verification status badge based on the workflow
+    render_campaign_grid(iter_campaigns(), key="browse", card_text=raised_text, show_status=True, total=total)
\ No newline at end of file
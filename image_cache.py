@@ -0,0 +1,216 @@
+"""
+HAVEN Crowdfunding Platform - Image Cache
+Fetches each campaign image once and serves card- and hero-sized variants from the
+app's static path, kept in a bounded memory and disk LRU
+"""
+
+import hashlib
+import io
+import ipaddress
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+import streamlit as st
+
+from static_assets import STATIC_DIR, STATIC_URL_PREFIX
+from ttl_cache import TTLCache
+from utils import get_setting
+
+# Variants need Pillow; without it campaigns keep their original image URLs
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+# Bounding box of each variant, in pixels
+VARIANTS = {"card": (480, 240), "hero": (1200, 600)}
+
+CACHE_DIR = os.path.join(STATIC_DIR, "images")
+
+# Originals larger than this are not fetched
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+
+SOURCE_TIMEOUT = (3.05, 10)
+
+# Hosts images are fetched from when [images] allowed_hosts is not set
+DEFAULT_ALLOWED_HOSTS = ("placehold.co",)
+
+
+class DisallowedSource(ValueError):
+    """The image URL is not on an allowed host, or resolves to a private address"""
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    return ip.is_global and not ip.is_multicast
+
+
+class ImageCache:
+    """Resizes remote images into static/images, off the render path.
+
+    The memory tier maps each source URL to the content hash of what it served
+    (re-checked after `ttl` seconds); variant files are named by that hash and
+    evicted least recently used first once they exceed `max_bytes` on disk. A
+    lookup that misses schedules the work and returns None, so the caller shows
+    the original this once and the variant on later renders.
+
+    Campaign image URLs come from users, so only http(s) URLs on
+    `allowed_hosts` (or their subdomains) are fetched, never ones that
+    resolve to private, loopback or link-local addresses, and redirects are
+    not followed.
+    """
+
+    def __init__(self, directory: str, url_prefix: str, max_bytes: int = 256 * 1024 * 1024,
+                 ttl: float = 86400, workers: int = 2, allowed_hosts: Iterable[str] = DEFAULT_ALLOWED_HOSTS):
+        self.directory = directory
+        self.allowed_hosts = tuple(host.lower().strip(".") for host in allowed_hosts)
+        self.url_prefix = url_prefix
+        self.max_bytes = max_bytes
+        self.sources = TTLCache(max_entries=50000, ttl=ttl)
+        self.failures = TTLCache(max_entries=10000, ttl=600)
+        self.format, self.extension = ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+        self.session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="haven-images")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+        # Files left by earlier runs, oldest first
+        os.makedirs(directory, exist_ok=True)
+        entries = sorted((entry for entry in os.scandir(directory) if entry.is_file()),
+                         key=lambda entry: entry.stat().st_mtime)
+        self._files: "OrderedDict[str, int]" = OrderedDict(
+            (entry.name, entry.stat().st_size) for entry in entries if not entry.name.endswith(".part")
+        )
+        self._bytes = sum(self._files.values())
+
+    def _file_name(self, content_hash: str, variant: str) -> str:
+        return f"{content_hash}-{variant}.{self.extension}"
+
+    def is_allowed(self, source_url: str) -> bool:
+        """Whether source_url is an http(s) URL on an allowed host"""
+        try:
+            parts = urlsplit(source_url)
+            host = (parts.hostname or "").lower()
+        except ValueError:
+            return False
+        return parts.scheme in ("http", "https") and any(
+            host == allowed or host.endswith("." + allowed) for allowed in self.allowed_hosts
+        )
+
+    def variant_url(self, source_url: str, variant: str) -> Optional[str]:
+        """Static URL of a variant of the image at source_url, or None if it is not ready (or never will be)"""
+        if not self.is_allowed(source_url):
+            return None
+        content_hash = self.sources.get(source_url)
+        if content_hash is not None:
+            name = self._file_name(content_hash, variant)
+            with self._lock:
+                if name in self._files:
+                    self._files.move_to_end(name)
+                    return f"{self.url_prefix}/{name}"
+            # Evicted from disk since; produce it again
+            self.sources.pop(source_url)
+        self._schedule(source_url)
+        return None
+
+    def _schedule(self, source_url: str):
+        if self.failures.get(source_url):
+            return
+        with self._lock:
+            if source_url in self._pending:
+                return
+            self._pending.add(source_url)
+        self._executor.submit(self._process, source_url)
+
+    def _check_addresses(self, source_url: str):
+        parts = urlsplit(source_url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        for *_, sockaddr in socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP):
+            if not _is_public_address(sockaddr[0]):
+                raise DisallowedSource(f"Image host resolves to a non-public address: {source_url}")
+
+    def _fetch(self, source_url: str) -> bytes:
+        if not self.is_allowed(source_url):
+            raise DisallowedSource(f"Image host is not allowed: {source_url}")
+        self._check_addresses(source_url)
+        with self.session.get(source_url, timeout=SOURCE_TIMEOUT, stream=True, allow_redirects=False) as response:
+            if response.is_redirect:
+                raise DisallowedSource(f"Image URL redirects: {source_url}")
+            response.raise_for_status()
+            data = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                data += chunk
+                if len(data) > MAX_SOURCE_BYTES:
+                    raise ValueError(f"Image larger than {MAX_SOURCE_BYTES} bytes: {source_url}")
+        return bytes(data)
+
+    def _process(self, source_url: str):
+        try:
+            data = self._fetch(source_url)
+            content_hash = hashlib.sha256(data).hexdigest()[:20]
+            with self._lock:
+                missing = [variant for variant in VARIANTS if self._file_name(content_hash, variant) not in self._files]
+            if missing:
+                image = Image.open(io.BytesIO(data))
+                # Decode JPEGs at the smallest scale that still covers the largest variant
+                image.draft("RGB", max(VARIANTS.values()))
+                image = image.convert("RGB")
+                for variant in missing:
+                    resized = image.copy()
+                    resized.thumbnail(VARIANTS[variant])
+                    self._store(self._file_name(content_hash, variant), resized)
+            self.sources.set(source_url, content_hash)
+        except (requests.exceptions.RequestException, OSError, ValueError, Image.DecompressionBombError):
+            # Keep showing the original; try again after a while
+            self.failures.set(source_url, True)
+        finally:
+            with self._lock:
+                self._pending.discard(source_url)
+
+    def _store(self, name: str, image):
+        path = os.path.join(self.directory, name)
+        image.save(path + ".part", self.format, quality=80)
+        os.replace(path + ".part", path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self._bytes += size - self._files.pop(name, 0)
+            self._files[name] = size
+            while self._bytes > self.max_bytes and len(self._files) > 1:
+                evicted, evicted_size = self._files.popitem(last=False)
+                self._bytes -= evicted_size
+                try:
+                    os.unlink(os.path.join(self.directory, evicted))
+                except FileNotFoundError:
+                    pass
+
+
+def _static_url_prefix() -> str:
+    # Absolute, because card components render inside iframes with their own base URL
+    base_path = st.get_option("server.baseUrlPath").strip("/")
+    return "/" + "/".join(part for part in (base_path, STATIC_URL_PREFIX, "images") if part)
+
+
+@st.cache_resource
+def get_image_cache() -> Optional[ImageCache]:
+    """Process-wide image cache, or None without Pillow or static file serving"""
+    if Image is None or not st.get_option("server.enableStaticServing"):
+        return None
+    return ImageCache(
+        CACHE_DIR, _static_url_prefix(),
+        max_bytes=get_setting("images", "cache_max_mb", 256) * 1024 * 1024,
+        allowed_hosts=get_setting("images", "allowed_hosts", DEFAULT_ALLOWED_HOSTS),
+    )
+
+
+def campaign_image(campaign: Dict, variant: str = "card") -> str:
+    """URL of a campaign's image resized for `variant`, falling back to the original"""
+    cache = get_image_cache()
+    if cache is None or not campaign.get("image"):
+        return campaign["image"]
+    return cache.variant_url(campaign["image"], variant) or campaign["image"]
@@ -0,0 +1,233 @@
+"""
+HAVEN Crowdfunding Platform - Live Funding Totals
+One process-wide subscriber to the backend's donation event stream, feeding an in-memory
+totals table that every session's progress display reads without calling the backend
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+import requests
+import streamlit as st
+
+from backend_client import get_background_client
+from campaign_analytics import DonationLog
+from catalogue_sync import CatalogueDelta
+from telemetry import count
+from utils import BACKEND_URL, get_catalogue_store, get_setting
+
+logger = logging.getLogger(__name__)
+
+# Server-sent events endpoint publishing `donation` events
+EVENTS_PATH = "/api/campaigns/events"
+
+# Seconds between progress redraws in each session (reads only the local table)
+DEFAULT_REFRESH_SECONDS = 5
+
+
+class FundingTotal(NamedTuple):
+    current_amount: float
+    donors_count: int
+    updated_at: float
+    # Id of the donation event this total came from; None for catalogue and contribution totals
+    sequence: Optional[int] = None
+
+
+class FundingTotals:
+    """Thread-safe table of the latest funding total of every campaign"""
+
+    def __init__(self, campaigns: Iterable[Dict] = ()):
+        self._totals: Dict[int, FundingTotal] = {}
+        self._lock = threading.Lock()
+        self.update_many(campaigns)
+
+    def get(self, campaign_id: int) -> Optional[FundingTotal]:
+        return self._totals.get(campaign_id)
+
+    def update(self, campaign_id: int, current_amount: float, donors_count: int = None, sequence: int = None):
+        """Record a new total, unless it comes from an event older than the one already applied.
+
+        Totals can go down (refunds, corrections), so updates are ordered by
+        event id rather than by amount. Totals without an event id are
+        snapshots read from the backend and always apply.
+        """
+        with self._lock:
+            known = self._totals.get(campaign_id)
+            if known is not None and sequence is not None and known.sequence is not None and sequence <= known.sequence:
+                return
+            if donors_count is None:
+                donors_count = known.donors_count if known else 0
+            if sequence is None and known is not None:
+                sequence = known.sequence
+            self._totals[campaign_id] = FundingTotal(current_amount, donors_count, time.time(), sequence)
+
+    def update_many(self, campaigns: Iterable[Dict]):
+        for campaign in campaigns:
+            self.update(campaign["id"], campaign["current_amount"], campaign.get("donors_count"))
+
+    def remove(self, campaign_ids: Iterable[int]):
+        with self._lock:
+            for campaign_id in campaign_ids:
+                self._totals.pop(campaign_id, None)
+
+    def apply_delta(self, delta: CatalogueDelta):
+        """Catalogue sync listener, so totals stay current even without the event stream"""
+        self.update_many(delta.upserted)
+        self.remove(delta.removed)
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], str, str]]:
+    """Yield (id, event, data) for each server-sent event in a stream of lines"""
+    event_id, event, data = None, "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield event_id, event, "\n".join(data)
+            event, data = "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "data":
+            data.append(value)
+        elif field == "event":
+            event = value
+        elif field == "id":
+            event_id = value
+
+
+def _event_sequence(event_id: Optional[str]) -> Optional[int]:
+    """An event id as a number to order totals by; None if the backend's ids are not numeric"""
+    try:
+        return int(event_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class DonationSubscriber:
+    """Background thread holding the single event stream connection for the process.
+
+    Reconnects with jittered backoff, resuming from the last event id. If the
+    backend has no event stream, it stops and the table is kept current by
+    catalogue sync deltas alone. Each donation is also appended to `log`, if
+    given, for analytics.
+    """
+
+    def __init__(self, client, totals: FundingTotals, log: DonationLog = None, max_backoff: float = 60):
+        self.client = client
+        self.totals = totals
+        self.log = log
+        self.max_backoff = max_backoff
+        self.last_event_id: Optional[str] = None
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="haven-donation-events", daemon=True)
+
+    def start(self) -> "DonationSubscriber":
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                if not self._listen():
+                    return
+                failures = 0
+            except (requests.exceptions.RequestException, ValueError):
+                failures += 1
+            except Exception:
+                # Never let an unexpected error end the thread and freeze the totals
+                logger.exception("Donation subscriber failed; reconnecting")
+                failures += 1
+            finally:
+                self.connected = False
+            count("donation_stream_reconnects")
+            self._stop.wait(random.uniform(0, min(self.max_backoff, 2 ** failures)))
+
+    def _listen(self) -> bool:
+        """Consume the stream until it ends; False if the backend does not offer one"""
+        headers = {"Accept": "text/event-stream"}
+        if self.last_event_id:
+            headers["Last-Event-ID"] = self.last_event_id
+        response = self.client.get(EVENTS_PATH, headers=headers, stream=True)
+        with response:
+            if response.status_code in (404, 405, 501):
+                return False
+            response.raise_for_status()
+            self.connected = True
+            previous_id = None
+            for event_id, event, data in parse_events(response.iter_lines(decode_unicode=True)):
+                if self._stop.is_set():
+                    break
+                # An event without its own id repeats the last one, so it carries no order of its own
+                sequence = _event_sequence(event_id) if event_id != previous_id else None
+                previous_id = event_id
+                if event_id is not None:
+                    self.last_event_id = event_id
+                if event == "donation":
+                    try:
+                        self._record(json.loads(data), sequence)
+                    except (KeyError, TypeError, ValueError):
+                        # One malformed payload is skipped, not allowed to end the stream
+                        count("donation_events", result="invalid")
+                        continue
+                    count("donation_events")
+        return True
+
+    def _record(self, payload: Dict, sequence: int = None):
+        campaign_id = int(payload["campaign_id"])
+        current_amount = float(payload["current_amount"])
+        known = self.totals.get(campaign_id)
+        if known is not None and sequence is not None and known.sequence is not None and sequence <= known.sequence:
+            return
+        self.totals.update(campaign_id, current_amount, payload.get("donors_count"), sequence)
+        if self.log is None:
+            return
+        # Events without an amount are read as the increase in the campaign's total
+        amount = payload.get("amount")
+        if amount is None:
+            amount = current_amount - known.current_amount if known else 0
+        if amount > 0:
+            self.log.append(campaign_id, amount, payload.get("donor_id"), payload.get("timestamp"))
+
+
+@st.cache_resource
+def get_donation_log() -> DonationLog:
+    """Process-wide log of the donations seen on the event stream since the process started"""
+    return DonationLog()
+
+
+@st.cache_resource
+def get_funding_totals() -> FundingTotals:
+    """Process-wide totals table, seeded from the catalogue and fed by the donation subscriber"""
+    store = get_catalogue_store()
+    totals = FundingTotals(store.campaigns)
+    store.add_listener(totals.apply_delta)
+    DonationSubscriber(get_background_client(BACKEND_URL), totals, get_donation_log()).start()
+    return totals
+
+
+def _refresh_interval() -> Optional[float]:
+    seconds = get_setting("performance", "live_refresh_seconds", DEFAULT_REFRESH_SECONDS)
+    return seconds if seconds and seconds > 0 else None
+
+
+@st.fragment(run_every=_refresh_interval())
+def render_funding_progress(campaign: Dict):
+    """Progress bar and raised amount, redrawn on their own from the shared totals table"""
+    live = get_funding_totals().get(campaign["id"])
+    current_amount = live.current_amount if live else campaign["current_amount"]
+    target_amount = campaign["target_amount"]
+    st.progress(min(max(current_amount / target_amount, 0.0), 1.0) if target_amount > 0 else 0.0)
+    st.markdown(f"**${current_amount:,.0f}** raised of **${target_amount:,.0f}** goal")
+    if live and live.donors_count:
+        st.caption(f"{live.donors_count:,} donors")
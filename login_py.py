@@ -10,6 +10,8 @@ Original file is located at
 import streamlit as st
 import requests
 from utils import render_logo, BACKEND_URL
+from backend_client import get_backend_client
+from session_store import start_session
 from streamlit_notify import notify
 
 def show():
@@ -23,16 +25,16 @@ def show():
             if st.form_submit_button("Login"):
                 if email and password:
                     try:
-                        response = requests.post(
-                            f"{BACKEND_URL}/api/login",
+                        # Not retried: each login issues a session and may count towards lockouts
+                        response = get_backend_client(BACKEND_URL).post(
+                            "/api/login",
                             json={"email": email, "password": password}
                         )
                         response.raise_for_status() # Raises an exception for bad responses (4xx or 5xx)
 
                         data = response.json()
-                        st.session_state.authenticated = True
-                        st.session_state.token = data['token']
-                        st.session_state.user_type = data['user_type'] # Store the user type
+                        # The token stays in the server-side store; the session only holds its handle
+                        start_session(data['token'], data['user_type'])
                         st.rerun()
 
                     except requests.exceptions.HTTPError as err:
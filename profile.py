@@ -1,14 +1,71 @@
+import requests
 import streamlit as st
 from utils import (
-    submit_campaign_for_review, 
-    get_individual_profile_data, 
-    get_organization_profile_data
+    submit_campaign_for_review,
+    get_campaign_index
 )
+from profile_data import SignInRequired, get_profile_service, invalidate_profile
+from request_scheduler import fetch_concurrently
+from session_store import current_token, current_user_id, end_session
 from streamlit_notify import notify
 
-def display_individual_profile():
+# History shown on each profile type: (history kind, heading, line per item)
+PROFILE_HISTORY = {
+    "individual": ("donations", "Your Donation History", "You donated to: **{title}**"),
+    "organization": ("campaigns", "Campaigns You Created", "You created the campaign: **{title}**"),
+}
+
+def _sign_in_again():
+    """The backend rejected the user's token: end the session and show the login page."""
+    end_session()
+    st.rerun()
+
+def _history_title(item, index):
+    """Title of a history item: its own, else the campaign's in the shared catalogue."""
+    if item.get("title"):
+        return item["title"]
+    campaign = index.get(item["campaign_id"])
+    return campaign["title"] if campaign else None
+
+@st.fragment
+def render_history(user_id, token, user_type):
+    """One page of the user's history; paging reruns only this fragment and fetches only that page."""
+    kind, heading, line = PROFILE_HISTORY[user_type]
+    offset_key = f"profile_{kind}_offset"
+    offset = st.session_state.get(offset_key, 0)
+    st.subheader(heading)
+    try:
+        page = get_profile_service().history(user_id, token, user_type, kind, offset)
+    except SignInRequired:
+        _sign_in_again()
+    except (requests.exceptions.RequestException, ValueError):
+        st.error("Your history could not be loaded right now.")
+        # Clicking reruns just this fragment, which fetches the page again
+        st.button("Try again", key=f"{kind}_retry")
+        return
+
+    index = get_campaign_index()
+    for item in page["items"]:
+        title = _history_title(item, index)
+        if title:
+            amount = f" (${item['amount']:,})" if item.get("amount") else ""
+            st.info(line.format(title=title) + amount)
+    if not page["items"]:
+        st.caption("Nothing here yet.")
+
+    if page["total"] > len(page["items"]):
+        page_size = get_profile_service().page_size
+        col1, col2, col3 = st.columns([1, 2, 1])
+        if col1.button("← Newer", key=f"{kind}_newer", disabled=offset == 0):
+            st.session_state[offset_key] = max(offset - page_size, 0)
+            st.rerun(scope="fragment")
+        col2.caption(f"{offset + 1:,}–{offset + len(page['items']):,} of {page['total']:,}")
+        if col3.button("Older →", key=f"{kind}_older", disabled=page["next_offset"] is None):
+            st.session_state[offset_key] = page["next_offset"]
+            st.rerun(scope="fragment")
+
+def display_individual_profile(profile_data):
     st.subheader("Your Personal Information")
-    profile_data = get_individual_profile_data()
     with st.form("individual_profile_form", border=True):
         st.text_input("Full Name", value=profile_data["full_name"])
         st.text_input("Email Address", value=profile_data["email"], disabled=True)
@@ -16,13 +73,9 @@ def display_individual_profile():
         st.text_area("Address", value=profile_data["address"])
         if st.form_submit_button("Update Profile"):
             notify("Profile updated successfully!", "success")
-    st.subheader("Your Donation History")
-    for campaign in profile_data["donated_to"]:
-        st.info(f"You donated to: **{campaign['title']}**")
 
-def display_organization_profile():
+def display_organization_profile(profile_data):
     st.subheader("Your Organization's Information")
-    profile_data = get_organization_profile_data()
     with st.form("organization_profile_form", border=True):
         st.text_input("Organization Name", value=profile_data["org_name"])
         st.text_input("Contact Person", value=profile_data["contact_person"])
@@ -32,19 +85,36 @@ def display_organization_profile():
         st.text_area("Organization Description", value=profile_data["org_description"])
         if st.form_submit_button("Update Profile"):
             notify("Organization profile updated successfully!", "success")
-    st.subheader("Campaigns You Created")
-    for campaign in profile_data["created_campaigns"]:
-        st.info(f"You created the campaign: **{campaign['title']}**")
 
 def show_profile_details():
     st.title("Your Profile")
     user_type = st.session_state.get("user_type")
+    if user_type not in PROFILE_HISTORY:
+        st.error("Could not determine user type. Please log in again.")
+        return
+
+    # The user's details and the history page shown below are independent backend
+    # calls, so fetch them side by side; the history fragment then reads its page
+    # from the profile cache.
+    user_id, token = current_user_id(), current_token()
+    service = get_profile_service()
+    kind = PROFILE_HISTORY[user_type][0]
+    offset = st.session_state.get(f"profile_{kind}_offset", 0)
+    try:
+        data = fetch_concurrently({
+            "profile": lambda: service.details(user_id, token, user_type),
+            "history": lambda: service.history(user_id, token, user_type, kind, offset),
+        })
+    except SignInRequired:
+        _sign_in_again()
+    except (requests.exceptions.RequestException, ValueError):
+        st.error("Your profile could not be loaded right now. Please try again shortly.")
+        return
     if user_type == "individual":
-        display_individual_profile()
-    elif user_type == "organization":
-        display_organization_profile()
+        display_individual_profile(data["profile"])
     else:
-        st.error("Could not determine user type. Please log in again.")
+        display_organization_profile(data["profile"])
+    render_history(user_id, token, user_type)
 
 def show_creation_form():
     st.title("Create a New Campaign")
@@ -57,4 +127,7 @@ def show_creation_form():
         if st.form_submit_button("Submit for Moderation"):
             data = {"title": title, "description": description, "category": category, "target_amount": target_amount}
             response = submit_campaign_for_review(data)
+            # The user's campaign list changed; their next profile view refetches it
+            invalidate_profile(current_user_id())
+            st.session_state.pop("profile_campaigns_offset", None)
             notify(response['message'], "success")
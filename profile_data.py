@@ -0,0 +1,234 @@
+"""
+HAVEN Crowdfunding Platform - Profile Data
+Per-user profile details and paginated activity history, cached per user with expiry and LRU eviction
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import requests
+import streamlit as st
+
+from telemetry import REGISTRY, count, span
+from ttl_cache import TTLCache
+from utils import (
+    BACKEND_URL,
+    get_backend_client,
+    get_individual_profile_data,
+    get_organization_profile_data,
+    get_setting,
+)
+
+PROFILE_PATH = "/api/users/me"
+
+# Paginated activity history, shaped like the /api/campaigns pages
+HISTORY_PATHS = {
+    "donations": "/api/users/me/donations",
+    "campaigns": "/api/users/me/campaigns",
+}
+
+DEFAULT_PAGE_SIZE = 10
+
+# History pages kept per user; pages further back are fetched again when revisited
+MAX_PAGES_PER_USER = 8
+
+# Activity figures are summed over at most this many history pages of this size
+ACTIVITY_PAGE_SIZE = 100
+MAX_ACTIVITY_PAGES = 20
+
+# Served when the backend has no profile endpoints: mock profiles per user type,
+# and which of their fields holds each history's campaign ids
+MOCK_PROFILES = {
+    "individual": (get_individual_profile_data, {"donations": "donated_to"}),
+    "organization": (get_organization_profile_data, {"campaigns": "created_campaigns"}),
+}
+
+
+class SignInRequired(Exception):
+    """The backend no longer accepts the user's token"""
+
+
+class UserProfile:
+    """One user's cached details and the history pages they have viewed"""
+
+    __slots__ = ("details", "mock", "pages", "activity", "_lock")
+
+    def __init__(self, details: Dict, mock: bool = False):
+        self.details = details
+        self.mock = mock
+        self.activity: Optional[Dict] = None
+        self.pages: "OrderedDict[Tuple[str, int, int], Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_page(self, key: Tuple[str, int, int]) -> Optional[Dict]:
+        with self._lock:
+            page = self.pages.get(key)
+            if page is not None:
+                self.pages.move_to_end(key)
+            return page
+
+    def set_page(self, key: Tuple[str, int, int], page: Dict):
+        with self._lock:
+            self.pages[key] = page
+            self.pages.move_to_end(key)
+            while len(self.pages) > MAX_PAGES_PER_USER:
+                self.pages.popitem(last=False)
+
+
+class ProfileService:
+    """Profile data for every signed-in user of the process, in one bounded cache.
+
+    Entries are keyed by user id, so no user is ever served another's data,
+    expire after `ttl` seconds, and the least recently used are evicted past
+    `max_users`. History is fetched a page at a time, so a profile costs the
+    same however long the user's history is. `invalidate` drops a user's
+    entry after they change something, e.g. create a campaign or contribute.
+    """
+
+    def __init__(self, client, ttl: float = 300, max_users: int = 1000, page_size: int = DEFAULT_PAGE_SIZE):
+        self.client = client
+        self.page_size = page_size
+        self.cache = TTLCache(max_entries=max_users, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def _get(self, path: str, token: Optional[str], params: Dict = None) -> Optional[Dict]:
+        """GET a profile endpoint; None if the backend does not have it"""
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        response = self.client.get(path, params=params, headers=headers)
+        if response.status_code in (404, 405, 501):
+            return None
+        if response.status_code in (401, 403):
+            raise SignInRequired()
+        response.raise_for_status()
+        return response.json()
+
+    def _entry(self, user_id: str, token: Optional[str], user_type: str) -> UserProfile:
+        """The user's cached entry, fetching their details on a miss.
+
+        Mock data stands in only when the backend has no profile endpoint;
+        SignInRequired and request errors propagate and nothing is cached,
+        so the next render tries the backend again.
+        """
+        entry = self.cache.get(user_id)
+        if entry is not None:
+            return entry
+        with span("profile_fetch", part="details"):
+            try:
+                details = self._get(PROFILE_PATH, token)
+            except (SignInRequired, requests.exceptions.RequestException, ValueError):
+                count("profile_fetch", result="error")
+                raise
+        entry = UserProfile(details) if details is not None else UserProfile(self._mock_details(user_type), mock=True)
+        # Concurrent fetches for the same user (details and history side by side)
+        # must end up sharing one entry, or pages cached on the other are lost
+        with self._lock:
+            existing = self.cache.get(user_id)
+            if existing is not None:
+                return existing
+            self.cache.set(user_id, entry)
+        return entry
+
+    def details(self, user_id: str, token: Optional[str], user_type: str) -> Dict:
+        return self._entry(user_id, token, user_type).details
+
+    def history(self, user_id: str, token: Optional[str], user_type: str, kind: str, offset: int = 0) -> Dict:
+        """One page of the user's donations or created campaigns.
+
+        Returns a dict with the page 'items' (each with at least a
+        'campaign_id'), the 'total' and the 'next_offset' (None on the last page).
+        Raises like details() when the backend cannot be read.
+        """
+        entry = self._entry(user_id, token, user_type)
+        key = (kind, offset, self.page_size)
+        page = entry.get_page(key)
+        if page is not None:
+            return page
+        page = self._fetch_page(entry, token, user_type, kind, offset, self.page_size)
+        entry.set_page(key, page)
+        return page
+
+    def activity(self, user_id: str, token: Optional[str], user_type: str) -> Dict:
+        """Campaigns created, donations, projects supported and total contributed, from the user's history.
+
+        Summed over up to MAX_ACTIVITY_PAGES pages and cached with the user's
+        entry, so it is recomputed only after `invalidate`. Raises like details().
+        """
+        entry = self._entry(user_id, token, user_type)
+        if entry.activity is not None:
+            return entry.activity
+        summary = {"campaigns_created": 0, "projects_supported": 0, "total_contributed": 0.0, "donations": 0}
+        _, history_fields = MOCK_PROFILES.get(user_type, MOCK_PROFILES["individual"])
+        for kind in history_fields:
+            items, total = [], 0
+            offset = 0
+            for _ in range(MAX_ACTIVITY_PAGES):
+                page = self._fetch_page(entry, token, user_type, kind, offset, ACTIVITY_PAGE_SIZE)
+                items.extend(page["items"])
+                total = page["total"]
+                if page["next_offset"] is None:
+                    break
+                offset = page["next_offset"]
+            if kind == "campaigns":
+                summary["campaigns_created"] = total
+            else:
+                summary["donations"] = total
+                summary["projects_supported"] = len({item["campaign_id"] for item in items})
+                summary["total_contributed"] = float(sum(item.get("amount") or 0 for item in items))
+        entry.activity = summary
+        return summary
+
+    def _fetch_page(self, entry: UserProfile, token: Optional[str], user_type: str, kind: str,
+                    offset: int, limit: int) -> Dict:
+        if entry.mock:
+            return self._mock_page(user_type, kind, offset, limit)
+        with span("profile_fetch", part=kind):
+            try:
+                page = self._get(HISTORY_PATHS[kind], token, {"offset": offset, "limit": limit})
+            except (SignInRequired, requests.exceptions.RequestException, ValueError):
+                count("profile_fetch", result="error")
+                raise
+        return page if page is not None else {"items": [], "total": 0, "next_offset": None}
+
+    def invalidate(self, user_id: Optional[str]):
+        """Forget a user's cached details and history"""
+        if user_id:
+            self.cache.pop(user_id)
+
+    @staticmethod
+    def _mock_details(user_type: str) -> Dict:
+        loader, history_fields = MOCK_PROFILES.get(user_type, MOCK_PROFILES["individual"])
+        return {key: value for key, value in loader().items() if key not in history_fields.values()}
+
+    @staticmethod
+    def _mock_page(user_type: str, kind: str, offset: int, limit: int) -> Dict:
+        loader, history_fields = MOCK_PROFILES.get(user_type, MOCK_PROFILES["individual"])
+        campaign_ids = loader().get(history_fields.get(kind), [])
+        end = offset + limit
+        return {
+            "items": [{"campaign_id": campaign_id} for campaign_id in campaign_ids[offset:end]],
+            "total": len(campaign_ids),
+            "next_offset": end if end < len(campaign_ids) else None,
+        }
+
+
+@st.cache_resource
+def get_profile_service() -> ProfileService:
+    """Process-wide profile cache configured from the [profile] secrets"""
+    service = ProfileService(
+        get_backend_client(BACKEND_URL),
+        ttl=get_setting("profile", "cache_ttl", 300),
+        max_users=get_setting("profile", "cache_entries", 1000),
+        page_size=get_setting("profile", "page_size", DEFAULT_PAGE_SIZE),
+    )
+    REGISTRY.register_collector("profile_cache", lambda: {
+        "hits": service.cache.hits,
+        "misses": service.cache.misses,
+        "entries": len(service.cache),
+    })
+    return service
+
+
+def invalidate_profile(user_id: Optional[str]):
+    """Drop a user's cached profile, e.g. after they create a campaign or contribute"""
+    get_profile_service().invalidate(user_id)
@@ -8,9 +8,18 @@ Original file is located at
 """
 
 import streamlit as st
-from utils import get_translated_text, render_logo
+from utils import get_bundle, render_logo
 from streamlit_extras.pdf_viewer import pdf_viewer
 from streamlit_notify import notify
+from uploads import upload_document
+
+# Every label this page shows, resolved in one get_bundle() call per rerun
+LABELS = (
+    'register_title', 'individual', 'organization', 'full_name', 'email_id', 'password',
+    'confirm_password', 'upload_document', 'register_button', 'passwords_not_match',
+    'org_name', 'contact_email', 'upload_cert', 'registration_success',
+    'document_upload_failed', 'cert_upload_failed',
+)
 
 def show():
     if 'language' not in st.session_state:
@@ -25,37 +34,42 @@ def show():
     )
     st.session_state.language = lang_map_display[selected_lang_display]
     lang = st.session_state.language
+    labels = get_bundle(LABELS, lang)
 
     col1, col2, col3 = st.columns([1, 4, 1])
     with col2:
         render_logo()
         with st.container(border=True):
-            st.markdown(f"## {get_translated_text('register_title', lang)}")
-            account_type = st.selectbox("Account Type", [get_translated_text('individual', lang), get_translated_text('organization', lang)])
+            st.markdown(f"## {labels['register_title']}")
+            account_type = st.selectbox("Account Type", [labels['individual'], labels['organization']])
 
-            if account_type == get_translated_text('individual', lang):
+            if account_type == labels['individual']:
                 with st.form("individual_register"):
-                    full_name = st.text_input(get_translated_text('full_name', lang))
-                    email = st.text_input(get_translated_text('email_id', lang))
-                    password = st.text_input(get_translated_text('password', lang), type="password")
-                    confirm_password = st.text_input(get_translated_text('confirm_password', lang), type="password")
-                    document_file = st.file_uploader(get_translated_text('upload_document', lang), type=['pdf', 'jpg', 'png'])
-
-                    if st.form_submit_button(get_translated_text('register_button', lang)):
-                        if password == confirm_password:
-                            notify("Registration successful! Please log in.", "success")
+                    full_name = st.text_input(labels['full_name'])
+                    email = st.text_input(labels['email_id'])
+                    password = st.text_input(labels['password'], type="password")
+                    confirm_password = st.text_input(labels['confirm_password'], type="password")
+                    document_file = st.file_uploader(labels['upload_document'], type=['pdf', 'jpg', 'png'])
+
+                    if st.form_submit_button(labels['register_button']):
+                        if password != confirm_password:
+                            notify(labels['passwords_not_match'], "error")
+                        elif document_file is not None and upload_document(document_file, "identity_document") is None:
+                            notify(labels['document_upload_failed'], "error")
                         else:
-                            notify(get_translated_text('passwords_not_match', lang), "error")
+                            notify(labels['registration_success'], "success")
             else:
                 with st.form("organization_register"):
-                    org_name = st.text_input(get_translated_text('org_name', lang))
-                    contact_email = st.text_input(get_translated_text('contact_email', lang))
-                    password = st.text_input(get_translated_text('password', lang), type="password")
-                    confirm_password = st.text_input(get_translated_text('confirm_password', lang), type="password")
-                    cert_file = st.file_uploader(get_translated_text('upload_cert', lang), type=['pdf', 'jpg', 'png'])
-
-                    if st.form_submit_button(get_translated_text('register_button', lang)):
-                        if password == confirm_password:
-                            notify("Registration successful! Please log in.", "success")
+                    org_name = st.text_input(labels['org_name'])
+                    contact_email = st.text_input(labels['contact_email'])
+                    password = st.text_input(labels['password'], type="password")
+                    confirm_password = st.text_input(labels['confirm_password'], type="password")
+                    cert_file = st.file_uploader(labels['upload_cert'], type=['pdf', 'jpg', 'png'])
+
+                    if st.form_submit_button(labels['register_button']):
+                        if password != confirm_password:
+                            notify(labels['passwords_not_match'], "error")
+                        elif cert_file is not None and upload_document(cert_file, "organization_certificate") is None:
+                            notify(labels['cert_upload_failed'], "error")
                         else:
-                            notify(get_translated_text('passwords_not_match', lang), "error")
\ No newline at end of file
+                            notify(labels['registration_success'], "success")
\ No newline at end of file
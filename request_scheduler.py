@@ -0,0 +1,62 @@
+"""
+HAVEN Crowdfunding Platform - Request Scheduler
+Runs the independent backend fetches of a page render concurrently, bounded process-wide
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Shared by every session, so this bounds the concurrent backend calls of the whole process
+MAX_WORKERS = 8
+
+
+@st.cache_resource
+def get_fetch_slots() -> threading.BoundedSemaphore:
+    """Process-wide limit on fetches running at once"""
+    return threading.BoundedSemaphore(MAX_WORKERS)
+
+
+def fetch_concurrently(calls: Dict[str, Callable[[], Any]], timeout: float = None) -> Dict[str, Any]:
+    """Run independent zero-argument fetches concurrently and return their results by name.
+
+    Blocks until every call has finished, so page latency tracks the slowest
+    call rather than the sum. Re-raises the exception of the first call that
+    failed, in the order the calls were given, and TimeoutError if a call is
+    still running after `timeout` seconds. Each call runs on its own
+    short-lived thread carrying the calling script's context, so st.cache_data
+    and st.secrets work inside it; calls must not render anything.
+    """
+    if len(calls) <= 1:
+        return {name: func() for name, func in calls.items()}
+
+    slots = get_fetch_slots()
+    results: Dict[str, Any] = {}
+    errors: Dict[str, BaseException] = {}
+
+    def run(name: str, func: Callable[[], Any]):
+        with slots:
+            try:
+                results[name] = func()
+            except BaseException as err:
+                errors[name] = err
+
+    ctx = get_script_run_ctx()
+    threads = []
+    for name, func in calls.items():
+        thread = threading.Thread(target=run, args=(name, func), name=f"haven-fetch-{name}", daemon=True)
+        add_script_run_ctx(thread, ctx)
+        thread.start()
+        threads.append(thread)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    for thread in threads:
+        thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        if thread.is_alive():
+            raise TimeoutError(f"{thread.name} did not finish within {timeout} seconds")
+    for name in calls:
+        if name in errors:
+            raise errors[name]
+    return results
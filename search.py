@@ -1,18 +1,17 @@
 import streamlit as st
-from utils import get_all_campaigns
-from streamlit_card import card
+from utils import get_search_index
+from campaign_grid import render_campaign_grid, goal_text
+
+MAX_RESULTS = 60
 
 def show():
     st.header("Search for a Campaign")
     query = st.text_input("Enter keywords")
     if query:
-        all_campaigns = get_all_campaigns()
-        results = [c for c in all_campaigns if query.lower() in c['title'].lower()]
+        index = get_search_index()
+        results = index.search(query, limit=MAX_RESULTS)
         if results:
-            st.subheader(f"Found {len(results)} results:")
-            cols = st.columns(3)
-            for i, campaign in enumerate(results):
-                with cols[i % 3]:
-                    card(title=campaign['title'], text=f"Goal: ${campaign['target_amount']:,}", image=campaign['image'], url="#")
+            st.subheader(f"Top {len(results)} results:" if len(results) == MAX_RESULTS else f"Found {len(results)} results:")
+            render_campaign_grid(results, key="search", card_text=goal_text, reset_on=query)
         else:
             st.warning("No campaigns found for your query.")
@@ -0,0 +1,207 @@
+"""
+HAVEN Crowdfunding Platform - Campaign Search Index
+In-process inverted index with BM25 ranking over campaign title, description and category
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Each occurrence of a term counts this many times towards its frequency in the document
+FIELD_WEIGHTS = {"title": 3, "category": 2, "description": 1}
+
+# Sorts after every character, so [prefix, prefix + PREFIX_END) spans the terms a prefix expands to
+PREFIX_END = "\U0010ffff"
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """Inverted index over campaigns, ranked with Okapi BM25 and updatable in place"""
+
+    # Once this share of the catalogue has changed since the last full reweight,
+    # the next update recomputes every posting so idf and length norms stay exact.
+    REWEIGHT_FRACTION = 0.2
+
+    def __init__(self, campaigns: Iterable[Dict], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # Document slots; removed campaigns leave a None that the next insert reuses
+        self.documents: List[Optional[Dict]] = []
+        self._frequencies: List[Optional[Counter]] = []
+        self._lengths: List[int] = []
+        self._slots: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+        self._total_length = 0
+        self._changes_since_reweight = 0
+        self._raw_postings: Dict[str, Dict[int, int]] = {}
+        # Postings hold each document's precomputed BM25 weight for the term,
+        # so answering a query is only lookups and additions.
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.vocabulary: List[str] = []
+        self._lock = threading.RLock()
+
+        for campaign in campaigns:
+            self._insert(campaign)
+        self._reweight(self._raw_postings)
+        self.vocabulary = sorted(self.postings)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _insert(self, campaign: Dict) -> Counter:
+        frequencies = self._field_frequencies(campaign)
+        slot = self._free_slots.pop() if self._free_slots else len(self.documents)
+        if slot == len(self.documents):
+            self.documents.append(None)
+            self._frequencies.append(None)
+            self._lengths.append(0)
+        self.documents[slot] = campaign
+        self._frequencies[slot] = frequencies
+        self._lengths[slot] = sum(frequencies.values())
+        self._total_length += self._lengths[slot]
+        self._slots[campaign["id"]] = slot
+        for term, frequency in frequencies.items():
+            self._raw_postings.setdefault(term, {})[slot] = frequency
+        return frequencies
+
+    def _delete(self, campaign_id: int) -> Counter:
+        slot = self._slots.pop(campaign_id, None)
+        if slot is None:
+            return Counter()
+        frequencies = self._frequencies[slot]
+        for term in frequencies:
+            del self._raw_postings[term][slot]
+        self._total_length -= self._lengths[slot]
+        self.documents[slot] = self._frequencies[slot] = None
+        self._lengths[slot] = 0
+        self._free_slots.append(slot)
+        return frequencies
+
+    def _reweight(self, terms: Iterable[str]):
+        """Recompute the BM25 postings of the given terms from their raw frequencies"""
+        document_count = len(self._slots)
+        average_length = self._total_length / document_count if document_count else 0.0
+        k1, b, lengths = self.k1, self.b, self._lengths
+        for term in list(terms):
+            posting = self._raw_postings.get(term)
+            if not posting:
+                self._raw_postings.pop(term, None)
+                self.postings.pop(term, None)
+                continue
+            idf = math.log(1 + (document_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            self.postings[term] = {
+                slot: idf * frequency * (k1 + 1)
+                / (frequency + k1 * (1 - b + b * lengths[slot] / average_length))
+                for slot, frequency in posting.items()
+            }
+
+    def update(self, upserted: Iterable[Dict] = (), removed_ids: Iterable[int] = ()):
+        """Apply a catalogue delta, reweighting only the terms it touches.
+
+        Untouched terms keep the idf and average length they were last weighted
+        with; the drift is bounded by REWEIGHT_FRACTION, after which everything
+        is reweighted.
+        """
+        with self._lock:
+            touched = set()
+            changed = 0
+            for campaign_id in removed_ids:
+                touched.update(self._delete(campaign_id))
+                changed += 1
+            for campaign in upserted:
+                touched.update(self._delete(campaign["id"]))
+                touched.update(self._insert(campaign))
+                changed += 1
+            if not changed:
+                return
+
+            self._changes_since_reweight += changed
+            if self._changes_since_reweight > self.REWEIGHT_FRACTION * max(len(self._slots), 1):
+                self._changes_since_reweight = 0
+                self._reweight(self._raw_postings)
+                self.vocabulary = sorted(self.postings)
+                return
+
+            indexed_before = {term for term in touched if term in self.postings}
+            self._reweight(touched)
+            for term in touched:
+                if term in indexed_before and term not in self.postings:
+                    del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+                elif term not in indexed_before and term in self.postings:
+                    bisect.insort(self.vocabulary, term)
+
+    @staticmethod
+    def _field_frequencies(campaign: Dict) -> Counter:
+        """Weighted term frequencies over a campaign's searchable fields"""
+        frequencies = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(str(campaign.get(field) or "")):
+                frequencies[token] += weight
+        return frequencies
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """Return every indexed term starting with prefix"""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + PREFIX_END, start)
+        return self.vocabulary[start:end]
+
+    def _token_scores(self, token: str, terms: List[str]) -> Dict[int, float]:
+        """Score of every document matching any of a token's terms, from the union of their postings"""
+        scores: Dict[int, float] = {}
+        for term in terms:
+            # Exact matches outrank completions of a prefix
+            boost = 1.0 if term == token else 0.5
+            for doc_index, weight in self.postings[term].items():
+                scores[doc_index] = scores.get(doc_index, 0.0) + boost * weight
+        return scores
+
+    def search(self, query: str, limit: int = None) -> List[Dict]:
+        """Return campaigns matching every query term (each as a prefix), best match first"""
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+        with self._lock:
+            return self._search(query_tokens, limit)
+
+    def _search(self, query_tokens: List[str], limit: Optional[int]) -> List[Dict]:
+        if not self._slots:
+            return []
+
+        # Each query token matches the union of postings of every term it prefixes,
+        # however many there are; a document must match all query tokens. Start
+        # from the rarest token so the candidate set only ever shrinks. Callers
+        # bound the work of rendering with `limit`, not by dropping terms.
+        expanded: List[Tuple[int, str, List[str]]] = []
+        for token in query_tokens:
+            terms = self.expand_prefix(token)
+            if not terms:
+                return []
+            expanded.append((sum(len(self.postings[term]) for term in terms), token, terms))
+        expanded.sort(key=lambda item: item[0])
+
+        _, rarest_token, rarest_terms = expanded[0]
+        scores = self._token_scores(rarest_token, rarest_terms)
+        for _, token, terms in expanded[1:]:
+            token_scores = self._token_scores(token, terms)
+            scores = {
+                doc_index: score + token_scores[doc_index]
+                for doc_index, score in scores.items() if doc_index in token_scores
+            }
+            if not scores:
+                return []
+
+        if limit is None:
+            ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores, key=scores.__getitem__)
+        return [self.documents[doc_index] for doc_index in ranked]
@@ -0,0 +1,288 @@
+"""
+HAVEN Crowdfunding Platform - Session Store
+Process-wide, thread-safe token store with cached claims, expiry and background refresh
+"""
+
+import base64
+import json
+import secrets
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import streamlit as st
+
+from backend_client import get_backend_client
+from utils import BACKEND_URL, get_setting
+
+# Query parameter carrying a short-lived, single-use resume handle, so a reload can
+# resume the session without the session handle itself ever appearing in the URL
+RESUME_PARAM = "resume"
+
+# Query parameter that carried the session handle in earlier versions; dropped on sight
+LEGACY_SESSION_PARAM = "sid"
+
+
+def decode_claims(token: str) -> Dict:
+    """Read the claims of a JWT without verifying it; the backend verifies tokens on every call.
+
+    Returns an empty dict for tokens that are not JWTs.
+    """
+    try:
+        payload = token.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError):
+        return {}
+
+
+class SessionRecord:
+    """One signed-in user's token and its decoded claims.
+
+    `ends_at` is the absolute end of the session, fixed at sign-in; refreshed
+    tokens never extend a session past it.
+    """
+
+    __slots__ = (
+        "token", "user_type", "claims", "expires_at", "refresh_at",
+        "ends_at", "issued_at", "last_seen", "resume_handle",
+    )
+
+    def __init__(self, token: str, user_type: str, max_age: float, refresh_margin: float, ends_at: float):
+        self.token = token
+        self.user_type = user_type
+        self.claims = decode_claims(token)
+        now = time.time()
+        self.ends_at = ends_at
+        self.expires_at = min(now + max_age, self.claims.get("exp", float("inf")), ends_at)
+        self.refresh_at = self.expires_at - refresh_margin
+        self.issued_at = now
+        self.last_seen = now
+        self.resume_handle: Optional[str] = None
+
+
+class TokenStore:
+    """Maps opaque session handles to tokens; lookups never touch the network.
+
+    Only sessions used since their token was issued are refreshed, so an
+    abandoned session lapses after `max_age`, and no session outlives
+    `max_lifetime` from sign-in. Session handles stay server-side; reloads
+    resume through single-use resume handles that expire after `resume_ttl`.
+    """
+
+    def __init__(
+        self,
+        max_age: float = 3600,
+        refresh_margin: float = 300,
+        refresher: Callable[[str], Optional[str]] = None,
+        refresh_interval: float = 30,
+        max_lifetime: float = 43200,
+        resume_ttl: float = 900,
+    ):
+        self.max_age = max_age
+        self.refresh_margin = min(refresh_margin, max_age / 2)
+        self.refresher = refresher
+        self.max_lifetime = max_lifetime
+        self.resume_ttl = resume_ttl
+        self._sessions: Dict[str, SessionRecord] = {}
+        # Resume handle -> (session handle, expiry)
+        self._resume: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        if refresher is not None:
+            threading.Thread(
+                target=self._refresh_loop, args=(refresh_interval,), name="haven-token-refresh", daemon=True
+            ).start()
+
+    def create(self, token: str, user_type: str) -> str:
+        """Store a freshly issued token and return the handle for its session"""
+        session_id = secrets.token_urlsafe(24)
+        record = SessionRecord(token, user_type, self.max_age, self.refresh_margin, time.time() + self.max_lifetime)
+        with self._lock:
+            self._sessions[session_id] = record
+        return session_id
+
+    def get(self, session_id: str, touch: bool = True) -> Optional[SessionRecord]:
+        """The live session for a handle, or None if it is unknown or expired; marks it as in use"""
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is not None and record.expires_at <= time.time():
+                self._drop(session_id)
+                record = None
+            if record is not None and touch:
+                record.last_seen = time.time()
+            return record
+
+    def revoke(self, session_id: str):
+        with self._lock:
+            self._drop(session_id)
+
+    def _drop(self, session_id: str):
+        record = self._sessions.pop(session_id, None)
+        if record is not None and record.resume_handle:
+            self._resume.pop(record.resume_handle, None)
+
+    def issue_resume_handle(self, session_id: str) -> Optional[str]:
+        """A new single-use handle that resumes the session after a reload, replacing the previous one"""
+        handle = secrets.token_urlsafe(24)
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None:
+                return None
+            if record.resume_handle:
+                self._resume.pop(record.resume_handle, None)
+            record.resume_handle = handle
+            self._resume[handle] = (session_id, time.time() + self.resume_ttl)
+        return handle
+
+    def redeem_resume_handle(self, handle: str) -> Optional[str]:
+        """The session handle a resume handle stands for, consuming it; None if unknown or expired"""
+        with self._lock:
+            session_id, expires_at = self._resume.pop(handle, (None, 0))
+            if session_id is None or expires_at <= time.time():
+                return None
+            record = self._sessions.get(session_id)
+            if record is not None and record.resume_handle == handle:
+                record.resume_handle = None
+        return session_id
+
+    def _refresh_due(self):
+        """Refresh tokens close to expiry of sessions in use, and drop the expired ones"""
+        now = time.time()
+        with self._lock:
+            for session_id in [sid for sid, record in self._sessions.items() if record.expires_at <= now]:
+                self._drop(session_id)
+            for handle in [handle for handle, (_, expires_at) in self._resume.items() if expires_at <= now]:
+                del self._resume[handle]
+            # Idle sessions, and ones already at their absolute end, are left to expire
+            due = [
+                (sid, record) for sid, record in self._sessions.items()
+                if record.refresh_at <= now and record.last_seen > record.issued_at and record.expires_at < record.ends_at
+            ]
+
+        for session_id, record in due:
+            try:
+                new_token = self.refresher(record.token)
+            except Exception:
+                new_token = None
+            if not new_token:
+                # Keep the current token until it expires; retry on the next pass
+                continue
+            with self._lock:
+                if self._sessions.get(session_id) is record:
+                    refreshed = SessionRecord(
+                        new_token, record.user_type, self.max_age, self.refresh_margin, record.ends_at
+                    )
+                    refreshed.resume_handle = record.resume_handle
+                    self._sessions[session_id] = refreshed
+
+    def _refresh_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self._refresh_due()
+
+    def close(self):
+        self._stop.set()
+
+
+def _refresh_token(token: str) -> Optional[str]:
+    response = get_backend_client(BACKEND_URL).post(
+        "/api/refresh", headers={"Authorization": f"Bearer {token}"}, idempotent=True
+    )
+    if response.status_code != 200:
+        return None
+    return response.json().get("token")
+
+
+@st.cache_resource
+def get_token_store() -> TokenStore:
+    """Process-wide token store, with lifetimes taken from the [session] secrets"""
+    return TokenStore(
+        max_age=get_setting("session", "max_age", 3600),
+        refresher=_refresh_token,
+        max_lifetime=get_setting("session", "max_lifetime", 43200),
+        resume_ttl=get_setting("session", "resume_ttl", 900),
+    )
+
+
+def _set_resume_handle(session_id: str):
+    """Put a fresh resume handle in the URL; the previous one stops working"""
+    handle = get_token_store().issue_resume_handle(session_id)
+    if handle:
+        st.query_params[RESUME_PARAM] = handle
+        st.session_state.resume_issued_at = time.time()
+
+
+def start_session(token: str, user_type: str):
+    """Sign the current browser session in and remember it across reloads"""
+    session_id = get_token_store().create(token, user_type)
+    st.session_state.session_id = session_id
+    st.session_state.authenticated = True
+    st.session_state.user_type = user_type
+    _set_resume_handle(session_id)
+
+
+def restore_session() -> bool:
+    """Validate or resume the current session from the store, without any network call.
+
+    Keeps st.session_state in sync with the stored session: signs out a session
+    whose token expired, and signs back in a reloaded page whose URL carries an
+    unused resume handle. The handle in the URL is replaced with a fresh one
+    once half its lifetime has passed, so an open page can always be reloaded
+    while an old copy of its URL soon stops working. Returns whether the user
+    is authenticated.
+    """
+    if LEGACY_SESSION_PARAM in st.query_params:
+        del st.query_params[LEGACY_SESSION_PARAM]
+    store = get_token_store()
+    session_id = st.session_state.get("session_id")
+    if not session_id and RESUME_PARAM in st.query_params:
+        session_id = store.redeem_resume_handle(st.query_params[RESUME_PARAM])
+        # Redeemed or not, that handle is spent
+        del st.query_params[RESUME_PARAM]
+        st.session_state.pop("resume_issued_at", None)
+    record = store.get(session_id) if session_id else None
+    if record is None:
+        if session_id:
+            end_session()
+        return bool(st.session_state.get("authenticated"))
+
+    st.session_state.session_id = session_id
+    st.session_state.authenticated = True
+    st.session_state.user_type = record.user_type
+    if time.time() - st.session_state.get("resume_issued_at", 0) > store.resume_ttl / 2:
+        _set_resume_handle(session_id)
+    return True
+
+
+def current_token() -> Optional[str]:
+    """The signed-in user's current (possibly refreshed) token"""
+    session_id = st.session_state.get("session_id")
+    record = get_token_store().get(session_id, touch=False) if session_id else None
+    return record.token if record else None
+
+
+def current_claims() -> Dict:
+    """Cached decoded claims of the signed-in user's token"""
+    session_id = st.session_state.get("session_id")
+    record = get_token_store().get(session_id, touch=False) if session_id else None
+    return record.claims if record else {}
+
+
+def current_user_id() -> Optional[str]:
+    """Stable id of the signed-in user for per-user caches: the token subject, else the session handle"""
+    subject = current_claims().get("sub")
+    return str(subject) if subject is not None else st.session_state.get("session_id")
+
+
+def end_session():
+    """Sign out and forget the session, here and in the store"""
+    session_id = st.session_state.pop("session_id", None)
+    if session_id:
+        get_token_store().revoke(session_id)
+    if RESUME_PARAM in st.query_params:
+        del st.query_params[RESUME_PARAM]
+    st.session_state.pop("resume_issued_at", None)
+    st.session_state.authenticated = False
+    st.session_state.pop("user_type", None)
+    # Idempotency keys belong to this user; the next one to sign in here must not reuse them
+    for key in ("contribution_keys", "contributions", "contributions_notified"):
+        st.session_state.pop(key, None)
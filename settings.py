@@ -0,0 +1,15 @@
+"""
+HAVEN Crowdfunding Platform - Settings
+Tolerant access to st.secrets, usable by modules that utils itself depends on
+"""
+
+import streamlit as st
+
+
+def get_setting(section, key, default=None):
+    """Reads `key` from the `[section]` table of st.secrets, falling back to `default`."""
+    try:
+        return st.secrets.get(section, {}).get(key, default)
+    except FileNotFoundError:
+        # No secrets.toml at all, e.g. local development
+        return default
@@ -0,0 +1,47 @@
+"""
+HAVEN Crowdfunding Platform - Static Assets
+Reads, hashes and encodes static assets once per process instead of on every render
+"""
+
+import base64
+import hashlib
+import mimetypes
+import os
+from typing import NamedTuple, Optional
+
+import streamlit as st
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# Where Streamlit serves STATIC_DIR when server.enableStaticServing is on
+STATIC_URL_PREFIX = "app/static"
+
+
+class Asset(NamedTuple):
+    name: str
+    content_hash: str
+    url: str
+
+
+@st.cache_resource
+def get_asset(name: str) -> Optional[Asset]:
+    """Load a file from static/ once and return a content-hashed URL for it.
+
+    With static serving enabled the browser fetches and caches the file itself,
+    and the hash in the URL busts that cache whenever the file changes. Otherwise
+    the URL is a data URI, encoded once per process. Returns None if the file
+    does not exist.
+    """
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.isfile(path):
+        return None
+
+    with open(path, "rb") as f:
+        data = f.read()
+    content_hash = hashlib.sha256(data).hexdigest()[:16]
+
+    if st.get_option("server.enableStaticServing"):
+        url = f"{STATIC_URL_PREFIX}/{name}?v={content_hash}"
+    else:
+        mime_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        url = f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
+    return Asset(name, content_hash, url)
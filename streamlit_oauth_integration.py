@@ -4,25 +4,22 @@ OAuth integration with translation and simplification support
 """
 
 import streamlit as st
-import requests
 import json
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from urllib.parse import urlencode, parse_qs, urlparse
 import hashlib
 import secrets
+from backend_client import get_backend_client
+from settings import get_setting
+from telemetry import span
+from translation_cache import get_translation_cache, translation_key
+from translation_catalog import SUPPORTED_LANGUAGES
+from translation_memory import fetch_translations
 
 # Configuration
 BACKEND_URL = st.secrets.get("BACKEND_URL", "https://haven-fastapi-backend.onrender.com")
 
-# Language support
-SUPPORTED_LANGUAGES = {
-    "en": {"name": "English", "flag": "🇺🇸", "native": "English"},
-    "hi": {"name": "Hindi", "flag": "🇮🇳", "native": "हिन्दी"},
-    "ta": {"name": "Tamil", "flag": "🇮🇳", "native": "தமிழ்"},
-    "te": {"name": "Telugu", "flag": "🇮🇳", "native": "తెలుగు"}
-}
-
 class EnhancedOAuthManager:
     """Enhanced OAuth manager with translation support"""
     
@@ -44,40 +41,48 @@ class EnhancedOAuthManager:
     
     def translate_text(self, text: str, target_language: str = None) -> str:
         """Translate text using backend API"""
+        return self.translate_many([text], target_language)[0]
+    
+    def translate_many(self, texts: List[str], target_language: str = None, source_language: str = "en") -> List[str]:
+        """Translate several texts with at most one backend round trip, using the shared cache"""
         if not target_language:
             target_language = st.session_state.get(self.language_key, "en")
         
-        if not text or target_language == "en":
-            return text
+        if target_language == source_language:
+            return list(texts)
         
-        try:
-            response = requests.post(
-                f"{self.backend_url}/api/translate/quick",
-                params={
-                    "text": text,
-                    "target_language": target_language,
-                    "source_language": "en"
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("translated_text", text)
-            else:
-                return text
+        cache = get_translation_cache()
+        keys = {text: translation_key(text, source_language, target_language) for text in texts if text}
+        with span("translation_cache_lookup", target=target_language):
+            translated = cache.get_many(keys.values())
+        missing = list(dict.fromkeys(text for text, key in keys.items() if key not in translated))
         
-        except Exception:
-            return text
+        # Fixed-size batches, so identical page renders in other sessions produce
+        # identical requests that the backend client can coalesce
+        batch_size = max(1, int(get_setting("performance", "batch_size", 8)))
+        for start in range(0, len(missing), batch_size):
+            fetched = self._fetch_translations(missing[start:start + batch_size], target_language, source_language)
+            new_entries = {keys[text]: result for text, result in fetched.items()}
+            cache.set_many(new_entries)
+            translated.update(new_entries)
+        
+        return [translated.get(keys[text], text) if text else text for text in texts]
+    
+    def _fetch_translations(self, texts: List[str], target_language: str, source_language: str) -> Dict[str, str]:
+        """Fetch translations from the backend; texts that fail are left out"""
+        return fetch_translations(get_backend_client(self.backend_url), texts, target_language, source_language)
     
     def display_translated_text(self, text: str, markdown: bool = True):
         """Display text with translation if needed"""
-        translated = self.translate_text(text)
-        
-        if markdown:
-            st.markdown(translated)
-        else:
-            st.text(translated)
+        self.display_translated_texts([text], markdown)
+    
+    def display_translated_texts(self, texts: List[str], markdown: bool = True):
+        """Display several texts, translated together in one batch"""
+        for translated in self.translate_many(texts):
+            if markdown:
+                st.markdown(translated)
+            else:
+                st.text(translated)
     
     def generate_state_token(self) -> str:
         """Generate secure state token for OAuth"""
@@ -101,11 +106,11 @@ class EnhancedOAuthManager:
                 return {"error": "Invalid state token"}
             
             # Exchange code for tokens
-            callback_url = f"{self.backend_url}/auth/{provider}/callback"
-            response = requests.get(
-                callback_url,
+            # Authorization codes are single use, so never resend the exchange
+            response = get_backend_client(self.backend_url).get(
+                f"/auth/{provider}/callback",
                 params={"code": code, "state": state},
-                timeout=30
+                idempotent=False
             )
             
             if response.status_code == 200:
@@ -234,12 +239,14 @@ class EnhancedOAuthManager:
             email = user_data.get("email", "No email")
             provider = user_data.get("provider", "Unknown")
             
-            self.display_translated_text(f"**Name:** {name}")
-            self.display_translated_text(f"**Email:** {email}")
-            self.display_translated_text(f"**Provider:** {provider.title()}")
-            
+            lines = [
+                f"**Name:** {name}",
+                f"**Email:** {email}",
+                f"**Provider:** {provider.title()}"
+            ]
             if "locale" in user_data:
-                self.display_translated_text(f"**Locale:** {user_data['locale']}")
+                lines.append(f"**Locale:** {user_data['locale']}")
+            self.display_translated_texts(lines)
             
             # Logout button
             if st.button("🚪 Sign Out", key="logout_button"):
@@ -263,14 +270,9 @@ class EnhancedOAuthManager:
             st.markdown("---")
             st.markdown("### 📊 Your Activity")
             
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Campaigns Created", "0")
-            with col2:
-                st.metric("Projects Supported", "0")
-            with col3:
-                st.metric("Total Contributed", "$0")
+            # Imported here so only signed-in users pay for loading the analytics module
+            from analytics import render_user_activity
+            render_user_activity()
             
             self.display_translated_text("""
             **Welcome to HAVEN!** You can now create campaigns, support projects, 
@@ -0,0 +1,243 @@
+"""
+HAVEN Crowdfunding Platform - Telemetry
+Lightweight timing spans, counters and latency histograms aggregated across sessions,
+exported as Prometheus text and shown in an admin-only debug panel
+"""
+
+import bisect
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+import streamlit as st
+
+from settings import get_setting
+
+# Read once: when disabled, span() returns a shared no-op and timed() leaves functions untouched
+ENABLED = bool(get_setting("telemetry", "enabled", False))
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: the upper bound of the bucket holding it"""
+        rank, seen = q * self.count, 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    """Process-wide metric store shared by every session"""
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        self.collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, labels: LabelKey, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[(name, labels)] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, labels: LabelKey, amount: float = 1):
+        with self._lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+
+    def register_collector(self, name: str, collect: Callable[[], Dict[str, float]]):
+        """Register a callback polled at export time, e.g. for cache hit/miss totals"""
+        with self._lock:
+            self.collectors[name] = collect
+
+    def snapshot(self):
+        with self._lock:
+            histograms = {key: (list(h.counts), h.total, h.count) for key, h in self.histograms.items()}
+            counters = dict(self.counters)
+            collectors = dict(self.collectors)
+        gauges = {}
+        for name, collect in collectors.items():
+            try:
+                gauges.update({f"{name}_{key}": value for key, value in collect().items()})
+            except Exception:
+                continue
+        return histograms, counters, gauges
+
+
+REGISTRY = Registry()
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class _Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: LabelKey):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        REGISTRY.observe(self.name, self.labels, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **labels):
+    """Context manager recording the duration of its body in the `name` latency histogram"""
+    if not ENABLED:
+        return _NOOP_SPAN
+    return _Span(name, _label_key(labels))
+
+
+def timed(name: str, **labels):
+    """Decorator form of span(); a no-op when telemetry is disabled"""
+    def decorator(func):
+        if not ENABLED:
+            return func
+        label_key = _label_key(labels)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(name, label_key):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, amount: float = 1, **labels):
+    """Increment the `name` counter"""
+    if ENABLED:
+        REGISTRY.increment(name, _label_key(labels), amount)
+
+
+def _format_labels(labels: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    histograms, counters, gauges = REGISTRY.snapshot()
+    lines: List[str] = []
+
+    for name in sorted({name for name, _ in histograms}):
+        lines.append(f"# TYPE haven_{name}_seconds histogram")
+        for (metric, labels), (counts, total, observations) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"haven_{name}_seconds_bucket{_format_labels(labels, (('le', le),))} {cumulative}")
+            lines.append(f"haven_{name}_seconds_sum{_format_labels(labels)} {total}")
+            lines.append(f"haven_{name}_seconds_count{_format_labels(labels)} {observations}")
+
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE haven_{name}_total counter")
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"haven_{name}_total{_format_labels(labels)} {value}")
+
+    for name, value in sorted(gauges.items()):
+        lines.append(f"# TYPE haven_{name} gauge")
+        lines.append(f"haven_{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@st.cache_resource
+def start_metrics_server():
+    """Serve /metrics on [telemetry] metrics_port (once per process), if telemetry is enabled"""
+    port = get_setting("telemetry", "metrics_port", 0)
+    if not ENABLED or not port:
+        return None
+    server = ThreadingHTTPServer(("0.0.0.0", int(port)), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="haven-metrics", daemon=True).start()
+    return server
+
+
+def render_debug_panel():
+    """Sidebar panel with latency percentiles and counters, for admins only"""
+    if not ENABLED or st.session_state.get("user_type") != "admin":
+        return
+    histograms, counters, gauges = REGISTRY.snapshot()
+    with st.sidebar.expander("Performance metrics"):
+        rows = []
+        for (name, labels), (counts, total, observations) in sorted(histograms.items()):
+            histogram = Histogram()
+            histogram.counts, histogram.total, histogram.count = counts, total, observations
+            rows.append({
+                "span": name,
+                "labels": ", ".join(f"{key}={value}" for key, value in labels),
+                "count": observations,
+                "mean ms": round(total / observations * 1000, 2) if observations else 0,
+                "p50 ms ≤": histogram.quantile(0.5) * 1000,
+                "p95 ms ≤": histogram.quantile(0.95) * 1000,
+            })
+        st.dataframe(rows, hide_index=True)
+        st.dataframe(
+            [{"counter": name, "labels": ", ".join(f"{k}={v}" for k, v in labels), "value": value}
+             for (name, labels), value in sorted(counters.items())]
+            + [{"counter": name, "labels": "", "value": value} for name, value in sorted(gauges.items())],
+            hide_index=True,
+        )
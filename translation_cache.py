@@ -0,0 +1,116 @@
+"""
+HAVEN Crowdfunding Platform - Translation Cache
+Process-wide in-memory LRU in front of an optional SQLite store, keyed by (text hash, source, target)
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import streamlit as st
+
+from ttl_cache import TTLCache
+from settings import get_setting
+from telemetry import REGISTRY
+
+TranslationKey = Tuple[str, str, str]
+
+# Keys looked up per SQLite query; older SQLite builds allow at most 999 parameters
+QUERY_CHUNK_SIZE = 500
+
+
+def translation_key(text: str, source_language: str, target_language: str) -> TranslationKey:
+    """Cache key for a translation, with the text reduced to its SHA-256 digest"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest(), source_language, target_language
+
+
+class SqliteTranslationStore:
+    """On-disk translation tier, so warm translations survive restarts"""
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS translations (
+                    text_hash TEXT NOT NULL,
+                    source_language TEXT NOT NULL,
+                    target_language TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (text_hash, source_language, target_language)
+                )"""
+            )
+
+    def get_many(self, keys: Iterable[TranslationKey]) -> Dict[TranslationKey, str]:
+        """One query per language pair and chunk of QUERY_CHUNK_SIZE keys"""
+        oldest = time.time() - self.ttl if self.ttl else 0
+        hashes_by_pair: Dict[Tuple[str, str], List[str]] = {}
+        for text_hash, source_language, target_language in keys:
+            hashes_by_pair.setdefault((source_language, target_language), []).append(text_hash)
+        found = {}
+        with self._lock:
+            for (source_language, target_language), hashes in hashes_by_pair.items():
+                for start in range(0, len(hashes), QUERY_CHUNK_SIZE):
+                    chunk = hashes[start:start + QUERY_CHUNK_SIZE]
+                    rows = self._connection.execute(
+                        "SELECT text_hash, translated_text FROM translations WHERE source_language = ? "
+                        f"AND target_language = ? AND created_at >= ? AND text_hash IN ({', '.join('?' * len(chunk))})",
+                        (source_language, target_language, oldest, *chunk),
+                    )
+                    for text_hash, translated in rows:
+                        found[(text_hash, source_language, target_language)] = translated
+        return found
+
+    def set_many(self, translations: Dict[TranslationKey, str]):
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                [(*key, translated, now) for key, translated in translations.items()],
+            )
+
+
+class TranslationCache:
+    """Two-level translation cache: shared memory LRU, then the optional SQLite store"""
+
+    def __init__(self, ttl: Optional[float] = 3600, max_entries: int = 50000, store: SqliteTranslationStore = None):
+        self.memory = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.store = store
+
+    def get_many(self, keys: Iterable[TranslationKey]) -> Dict[TranslationKey, str]:
+        keys = list(keys)
+        found = self.memory.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing and self.store is not None:
+            from_disk = self.store.get_many(missing)
+            for key, translated in from_disk.items():
+                self.memory.set(key, translated)
+            found.update(from_disk)
+        return found
+
+    def set_many(self, translations: Dict[TranslationKey, str]):
+        for key, translated in translations.items():
+            self.memory.set(key, translated)
+        if translations and self.store is not None:
+            self.store.set_many(translations)
+
+
+@st.cache_resource
+def get_translation_cache() -> TranslationCache:
+    """Process-wide translation cache configured from the [translation] secrets"""
+    ttl = get_setting("translation", "cache_ttl", 3600)
+    disk_path = get_setting("translation", "disk_cache_path", "")
+    store = SqliteTranslationStore(disk_path, ttl=ttl) if disk_path else None
+    cache = TranslationCache(ttl=ttl, store=store)
+    REGISTRY.register_collector("translation_cache", lambda: {
+        "hits": cache.memory.hits,
+        "misses": cache.memory.misses,
+        "entries": len(cache.memory),
+    })
+    return cache
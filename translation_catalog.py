@@ -0,0 +1,146 @@
+"""
+HAVEN Crowdfunding Platform - Translation Catalogs
+Per-language UI strings compiled to gettext .mo files and loaded only for the languages in use
+
+Usage: python translation_catalog.py  (recompiles every locales/<lang>/LC_MESSAGES/haven.po)
+"""
+
+import ast
+import gettext
+import io
+import os
+import struct
+from typing import Dict, List, Tuple
+
+import streamlit as st
+
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+DOMAIN = "haven"
+DEFAULT_LANGUAGE = "en"
+
+# Languages offered in the UI
+SUPPORTED_LANGUAGES = {
+    "en": {"name": "English", "flag": "🇺🇸", "native": "English"},
+    "hi": {"name": "Hindi", "flag": "🇮🇳", "native": "हिन्दी"},
+    "ta": {"name": "Tamil", "flag": "🇮🇳", "native": "தமிழ்"},
+    "te": {"name": "Telugu", "flag": "🇮🇳", "native": "తెలుగు"}
+}
+
+_MO_MAGIC = 0x950412DE
+_MO_HEADER = "Content-Type: text/plain; charset=UTF-8\n"
+
+
+def _catalog_paths(lang: str, locale_dir: str = LOCALE_DIR) -> Tuple[str, str]:
+    base = os.path.join(locale_dir, lang, "LC_MESSAGES", DOMAIN)
+    return base + ".po", base + ".mo"
+
+
+def read_po(path: str) -> Dict[str, str]:
+    """Parse the msgid/msgstr pairs of a .po file (no plurals or contexts)"""
+    messages: Dict[str, str] = {}
+    msgid = msgstr = None
+    field = None
+
+    def flush():
+        if msgid and msgstr:
+            messages[msgid] = msgstr
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("msgid "):
+                flush()
+                msgid, msgstr, field = ast.literal_eval(line[6:]), None, "msgid"
+            elif line.startswith("msgstr "):
+                msgstr, field = ast.literal_eval(line[7:]), "msgstr"
+            elif line.startswith('"'):
+                # Continuation of the previous string
+                if field == "msgid":
+                    msgid += ast.literal_eval(line)
+                elif field == "msgstr":
+                    msgstr += ast.literal_eval(line)
+    flush()
+    return messages
+
+
+def build_mo(messages: Dict[str, str]) -> bytes:
+    """Serialize messages in the GNU .mo format, with ids sorted for binary search"""
+    entries = sorted({"": _MO_HEADER, **messages}.items())
+    ids = [key.encode("utf-8") for key, _ in entries]
+    strs = [value.encode("utf-8") for _, value in entries]
+
+    header_size = 7 * 4
+    ids_table = header_size
+    strs_table = ids_table + len(entries) * 8
+    data_start = strs_table + len(entries) * 8
+
+    offsets, data = [], io.BytesIO()
+    for encoded in ids + strs:
+        offsets.append((len(encoded), data_start + data.tell()))
+        data.write(encoded + b"\0")
+
+    output = io.BytesIO()
+    output.write(struct.pack("<7I", _MO_MAGIC, 0, len(entries), ids_table, strs_table, 0, 0))
+    for length, offset in offsets:
+        output.write(struct.pack("<2I", length, offset))
+    output.write(data.getvalue())
+    return output.getvalue()
+
+
+def compile_catalogs(locale_dir: str = LOCALE_DIR) -> List[str]:
+    """Compile every .po file newer than its .mo; returns the languages compiled"""
+    compiled = []
+    for lang in sorted(os.listdir(locale_dir)):
+        po_path, mo_path = _catalog_paths(lang, locale_dir)
+        if not os.path.isfile(po_path):
+            continue
+        if os.path.isfile(mo_path) and os.path.getmtime(mo_path) >= os.path.getmtime(po_path):
+            continue
+        with open(mo_path, "wb") as f:
+            f.write(build_mo(read_po(po_path)))
+        compiled.append(lang)
+    return compiled
+
+
+def available_languages(locale_dir: str = LOCALE_DIR) -> List[str]:
+    """Languages that have a catalog, without loading any of them"""
+    return sorted(
+        lang for lang in os.listdir(locale_dir)
+        if any(os.path.isfile(path) for path in _catalog_paths(lang, locale_dir))
+    )
+
+
+def _load(lang: str) -> gettext.NullTranslations:
+    po_path, mo_path = _catalog_paths(lang)
+    if os.path.isfile(mo_path) and (
+        not os.path.isfile(po_path) or os.path.getmtime(mo_path) >= os.path.getmtime(po_path)
+    ):
+        with open(mo_path, "rb") as f:
+            return gettext.GNUTranslations(f)
+    if os.path.isfile(po_path):
+        # Edited but not recompiled, e.g. during development
+        return gettext.GNUTranslations(io.BytesIO(build_mo(read_po(po_path))))
+    return gettext.NullTranslations()
+
+
+@st.cache_resource
+def get_catalog(lang: str = DEFAULT_LANGUAGE) -> gettext.NullTranslations:
+    """One language's catalog, loaded on first use; missing keys fall back to English, then to the key"""
+    catalog = _load(lang)
+    if lang != DEFAULT_LANGUAGE:
+        catalog.add_fallback(get_catalog(DEFAULT_LANGUAGE))
+    return catalog
+
+
+@st.cache_resource
+def get_bundle(keys: Tuple[str, ...], lang: str = DEFAULT_LANGUAGE) -> Dict[str, str]:
+    """Every label a page needs, resolved in one call and shared by all sessions using that language"""
+    catalog = get_catalog(lang)
+    return {key: catalog.gettext(key) for key in keys}
+
+
+if __name__ == "__main__":
+    for compiled_lang in compile_catalogs():
+        print(f"Compiled {compiled_lang}")
@@ -0,0 +1,201 @@
+"""
+HAVEN Crowdfunding Platform - Translation Memory
+Persistent store of campaign translations, filled in the background as the catalogue changes
+so pages read translated campaigns without calling the backend
+"""
+
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import requests
+import streamlit as st
+
+from backend_client import BackendClient
+from catalogue_sync import CatalogueDelta
+from rate_limit import TokenBucket
+from telemetry import count
+from translation_cache import SqliteTranslationStore, TranslationCache, translation_key
+from translation_catalog import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES
+from utils import BACKEND_URL, get_catalogue_store, get_setting
+
+# Campaign fields that are translated
+TRANSLATED_FIELDS = ("title", "description")
+
+DEFAULT_MEMORY_PATH = os.path.join(os.path.expanduser("~"), ".streamlit", "haven-translation-memory.sqlite3")
+
+logger = logging.getLogger(__name__)
+
+# Clients whose backend has no batch endpoint, and when to try it again
+_batch_unavailable_until: "weakref.WeakKeyDictionary[object, float]" = weakref.WeakKeyDictionary()
+
+
+def fetch_translations(client, texts: List[str], target_language: str, source_language: str) -> Dict[str, str]:
+    """Translate texts through the backend; texts that fail are left out.
+
+    A backend without the batch endpoint is remembered per client for
+    [translation] batch_retry_interval seconds, so later calls go straight
+    to the per-text endpoint instead of paying for a 404 each time.
+    """
+    if time.monotonic() >= _batch_unavailable_until.get(client, 0):
+        try:
+            response = client.post(
+                "/api/translate/batch",
+                json={
+                    "texts": texts,
+                    "target_language": target_language,
+                    "source_language": source_language
+                },
+                idempotent=True
+            )
+            if response.status_code == 200:
+                results = response.json().get("translations", [])
+                return {text: result for text, result in zip(texts, results) if result}
+            if response.status_code not in (404, 405):
+                return {}
+        except (requests.exceptions.RequestException, ValueError):
+            return {}
+        _batch_unavailable_until[client] = time.monotonic() + get_setting("translation", "batch_retry_interval", 3600)
+
+    # Backend without the batch endpoint: fall back to one quick call per text
+    fetched = {}
+    for text in texts:
+        try:
+            response = client.post(
+                "/api/translate/quick",
+                params={
+                    "text": text,
+                    "target_language": target_language,
+                    "source_language": source_language
+                },
+                idempotent=True
+            )
+            if response.status_code == 200:
+                fetched[text] = response.json().get("translated_text", text)
+        except (requests.exceptions.RequestException, ValueError):
+            break
+    return fetched
+
+
+class CampaignPretranslator:
+    """Translates new and changed campaigns into every target language on a background thread.
+
+    Texts are keyed by content hash, so a campaign whose title and description
+    did not change (e.g. only its funding total did) costs a local lookup and
+    no backend call. Work left when the backend is unavailable is retried
+    after `retry_interval` seconds.
+    """
+
+    def __init__(self, client, memory: TranslationCache, languages: Iterable[str],
+                 source_language: str = DEFAULT_LANGUAGE, batch_size: int = 32, retry_interval: float = 60):
+        self.client = client
+        self.memory = memory
+        self.languages = [lang for lang in languages if lang != source_language]
+        self.source_language = source_language
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        # Latest version of each campaign waiting to be translated, oldest first
+        self._pending: "OrderedDict[int, Dict]" = OrderedDict()
+        self._wakeup = threading.Condition()
+        threading.Thread(target=self._run, name="haven-pretranslate", daemon=True).start()
+
+    def enqueue(self, campaigns: Iterable[Dict]):
+        with self._wakeup:
+            for campaign in campaigns:
+                self._pending.pop(campaign["id"], None)
+                self._pending[campaign["id"]] = campaign
+            self._wakeup.notify()
+
+    def on_delta(self, delta: CatalogueDelta):
+        """Catalogue sync listener"""
+        self.enqueue(delta.upserted)
+
+    def _take_batch(self) -> List[Dict]:
+        with self._wakeup:
+            self._wakeup.wait_for(lambda: self._pending)
+            return [self._pending.popitem(last=False)[1] for _ in range(min(self.batch_size, len(self._pending)))]
+
+    def _run(self):
+        while True:
+            campaigns = self._take_batch()
+            try:
+                done = self._translate(campaigns)
+            except Exception:
+                # E.g. a locked or full translation memory; keep the thread alive and retry later
+                logger.exception("Pretranslating %d campaigns failed", len(campaigns))
+                count("pretranslation", result="error")
+                done = False
+            if not done:
+                self.enqueue(campaigns)
+                time.sleep(self.retry_interval)
+
+    def _translate(self, campaigns: List[Dict]) -> bool:
+        """Translate the campaigns' missing texts; False if the backend could not be reached"""
+        texts = list(dict.fromkeys(
+            campaign[field] for campaign in campaigns for field in TRANSLATED_FIELDS if campaign.get(field)
+        ))
+        complete = True
+        for lang in self.languages:
+            keys = {text: translation_key(text, self.source_language, lang) for text in texts}
+            known = self.memory.get_many(keys.values())
+            missing = [text for text, key in keys.items() if key not in known]
+            if not missing:
+                continue
+            fetched = fetch_translations(self.client, missing, lang, self.source_language)
+            self.memory.set_many({keys[text]: translated for text, translated in fetched.items()})
+            # Partial results are kept; only a batch that got nothing back is retried
+            complete = complete and bool(fetched)
+        return complete
+
+
+@st.cache_resource
+def get_translation_memory() -> TranslationCache:
+    """Process-wide translation memory on disk at [translation] memory_path; entries never expire"""
+    path = get_setting("translation", "memory_path", "") or DEFAULT_MEMORY_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return TranslationCache(ttl=None, store=SqliteTranslationStore(path))
+
+
+@st.cache_resource
+def start_pretranslation() -> Optional[CampaignPretranslator]:
+    """Translate the catalogue once and then every change to it, if [translation] pretranslate is on.
+
+    Started by the campaign page the first time someone views it in another
+    language, so neither cold start nor sign-in waits on the catalogue. It uses
+    its own client and small budget ([translation] pretranslate_requests_per_minute),
+    so its backlog never spends the request budget that user traffic shares.
+    """
+    if not get_setting("translation", "pretranslate", True):
+        return None
+    store = get_catalogue_store()
+    requests_per_minute = get_setting("translation", "pretranslate_requests_per_minute", 10)
+    # Waits for its budget rather than failing: nobody is waiting on this client
+    client = BackendClient(
+        BACKEND_URL, pool_maxsize=2, rate_limiter=TokenBucket.per_minute(requests_per_minute), max_queue_wait=120
+    )
+    pretranslator = CampaignPretranslator(
+        client, get_translation_memory(), SUPPORTED_LANGUAGES,
+        batch_size=get_setting("translation", "pretranslate_batch_size", 32),
+    )
+    store.add_listener(pretranslator.on_delta)
+    pretranslator.enqueue(store.campaigns)
+    return pretranslator
+
+
+def localize_campaign(campaign: Dict, lang: str) -> Dict:
+    """The campaign with its title and description in `lang`, where the memory has them.
+
+    Reads only the local translation memory; untranslated fields stay in the source language.
+    """
+    if lang == DEFAULT_LANGUAGE:
+        return campaign
+    keys = {field: translation_key(campaign[field], DEFAULT_LANGUAGE, lang)
+            for field in TRANSLATED_FIELDS if campaign.get(field)}
+    translated = get_translation_memory().get_many(keys.values())
+    if not translated:
+        return campaign
+    return {**campaign, **{field: translated[key] for field, key in keys.items() if key in translated}}
@@ -0,0 +1,68 @@
+"""
+HAVEN Crowdfunding Platform - TTL Cache
+Thread-safe, size-bounded LRU cache whose entries expire after a fixed time-to-live
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache with per-entry expiry, safe to share between Streamlit sessions"""
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expiry(self) -> Optional[float]:
+        return time.monotonic() + self.ttl if self.ttl else None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Return the cached values of every key that is present"""
+        found = {}
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                found[key] = value
+        return found
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, self._expiry())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,237 @@
+"""
+HAVEN Crowdfunding Platform - Uploads
+Streams uploaded documents to a spool directory in fixed-size chunks, previews them
+off-thread and forwards them to the backend as a streamed multipart body
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterator, NamedTuple, Optional
+
+import requests
+import streamlit as st
+
+from utils import BACKEND_URL, get_backend_client, get_setting
+
+# Previews are optional: without Pillow (images) or pypdfium2 (PDFs) documents have none
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+UPLOADS_PATH = "/api/uploads"
+
+# Statuses meaning the backend has no upload endpoint, rather than that the upload failed
+UNAVAILABLE_STATUSES = (404, 405, 501)
+
+# Bytes read, hashed, written and sent at a time; bounds the memory an upload costs us
+CHUNK_SIZE = 1024 * 1024
+
+PREVIEW_SIZE = (320, 320)
+
+
+class SpooledFile(NamedTuple):
+    name: str
+    content_type: str
+    path: str
+    size: int
+    sha256: str
+
+
+class UploadSpool:
+    """Spool directory with one file per upload; files older than `max_age` seconds are pruned"""
+
+    PRUNE_INTERVAL = 600
+
+    def __init__(self, directory: str, max_age: float = 86400):
+        self.directory = directory
+        self.max_age = max_age
+        self._last_pruned = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def store(self, file: BinaryIO, name: str, content_type: str) -> SpooledFile:
+        """Copy a file object into the spool CHUNK_SIZE bytes at a time, hashing it on the way"""
+        if hasattr(file, "seek"):
+            file.seek(0)
+        digest, size = hashlib.sha256(), 0
+        fd, part_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = file.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            # One file per upload, so discarding it never pulls the file from under
+            # a concurrent upload of the same document
+            path = os.path.join(self.directory, f"{sha256}-{uuid.uuid4().hex}{os.path.splitext(name)[1].lower()}")
+            os.replace(part_path, path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.unlink(part_path)
+            raise
+        self.prune()
+        return SpooledFile(name, content_type or "application/octet-stream", path, size, sha256)
+
+    def discard(self, spooled: SpooledFile):
+        """Delete a spooled file and its preview, e.g. once the backend has accepted it"""
+        for path in (spooled.path, os.path.splitext(spooled.path)[0] + ".preview.jpg"):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+
+    def prune(self):
+        """Delete expired spool files, at most once every PRUNE_INTERVAL seconds"""
+        now = time.time()
+        if now - self._last_pruned < self.PRUNE_INTERVAL:
+            return
+        self._last_pruned = now
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_file() and now - entry.stat().st_mtime > self.max_age:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+
+
+def make_preview(spooled: SpooledFile) -> Optional[str]:
+    """Render a JPEG thumbnail of an image or a PDF's first page next to the spooled file.
+
+    Returns its path, or None when the type is not previewable, the optional
+    libraries are missing or the document cannot be decoded.
+    """
+    if Image is None:
+        return None
+    preview_path = os.path.splitext(spooled.path)[0] + ".preview.jpg"
+    if os.path.exists(preview_path):
+        return preview_path
+    try:
+        if spooled.content_type == "application/pdf":
+            if pypdfium2 is None:
+                return None
+            pdf = pypdfium2.PdfDocument(spooled.path)
+            try:
+                page = pdf[0]
+                image = page.render(scale=PREVIEW_SIZE[0] / page.get_width()).to_pil()
+            finally:
+                pdf.close()
+        elif spooled.content_type.startswith("image/"):
+            image = Image.open(spooled.path)
+            # JPEGs are then decoded at a reduced scale instead of in full
+            image.draft("RGB", PREVIEW_SIZE)
+        else:
+            return None
+        image = image.convert("RGB")
+        image.thumbnail(PREVIEW_SIZE)
+        part_path = preview_path + ".part"
+        image.save(part_path, "JPEG", quality=80)
+        os.replace(part_path, preview_path)
+    except Exception:
+        # A document that cannot be decoded simply has no preview
+        return None
+    return preview_path
+
+
+class MultipartBody:
+    """multipart/form-data body that streams its file from disk.
+
+    It has a known length, so it is sent with a Content-Length header, and can
+    be iterated again if the request is retried.
+    """
+
+    def __init__(self, fields: Dict[str, str], file_field: str, spooled: SpooledFile):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.spooled = spooled
+        parts = [
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in fields.items()
+        ]
+        filename = spooled.name.replace('"', "%22").replace("\r", "").replace("\n", "")
+        parts.append(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+            f"Content-Type: {spooled.content_type}\r\n\r\n"
+        )
+        self._head = "".join(parts).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._head) + self.spooled.size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        with open(self.spooled.path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        yield self._tail
+
+
+def forward_upload(spooled: SpooledFile, kind: str, token: str = None) -> Optional[Dict]:
+    """Stream a spooled file to the backend; returns its JSON response, or None if it has no upload endpoint"""
+    body = MultipartBody({"kind": kind, "sha256": spooled.sha256}, "file", spooled)
+    headers = {"Content-Type": body.content_type}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    response = get_backend_client(BACKEND_URL).post(UPLOADS_PATH, data=body, headers=headers)
+    if response.status_code in UNAVAILABLE_STATUSES:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_resource
+def get_upload_spool() -> UploadSpool:
+    """Process-wide spool in [uploads] spool_dir (a temporary directory by default)"""
+    directory = get_setting("uploads", "spool_dir", "") or os.path.join(tempfile.gettempdir(), "haven-uploads")
+    return UploadSpool(directory, max_age=get_setting("uploads", "max_age", 86400))
+
+
+@st.cache_resource
+def get_preview_executor() -> ThreadPoolExecutor:
+    """Small process-wide pool for decoding documents into previews"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="haven-preview")
+
+
+def upload_document(uploaded_file, kind: str, token: str = None) -> Optional[Dict]:
+    """Spool, preview and forward a st.file_uploader file.
+
+    The preview renders while the file is being sent, and is shown if it is
+    ready by then. Returns the backend's response, or None if forwarding failed.
+    A backend without an upload endpoint gets the document with the form, as
+    before uploads were forwarded, and the result is an empty dict.
+    """
+    spool = get_upload_spool()
+    spooled = spool.store(uploaded_file, uploaded_file.name, uploaded_file.type)
+    preview = get_preview_executor().submit(make_preview, spooled)
+    try:
+        with st.spinner("Uploading document..."):
+            result = forward_upload(spooled, kind, token)
+        if result is None:
+            result = {}
+    except (requests.exceptions.RequestException, ValueError, OSError):
+        # OSError: the spooled file could not be read back, e.g. pruned meanwhile
+        result = None
+
+    preview_path = preview.result() if preview.done() else None
+    if preview_path:
+        st.image(preview_path, caption=f"{spooled.name} ({spooled.size / 1024:,.0f} KB)", width=160)
+    if result is not None:
+        # Nothing is left to send, so the spool does not keep the document until it expires
+        spool.discard(spooled)
+    return result
@@ -10,85 +10,53 @@ Original file is located at
 # -*- coding: utf-8 -*-
 import streamlit as st
 import os
-import requests
-import base64
+import hashlib
+from backend_client import get_background_client, get_backend_client
+from catalogue_sync import CatalogueStore
+from glossary import Glossary
+from settings import get_setting
+from static_assets import get_asset
+from telemetry import timed
+from translation_catalog import get_bundle, get_catalog
 
 # --- Environment variables and Configuration ---
 BACKEND_URL = os.getenv("BACKEND_URL", "https://haven-fastapi-backend.onrender.com")
 
 # --- Translation and Simplification Dictionaries from front_main.py ---
-TRANSLATION_DICT = {
-    'en': {
-        'login': 'Login', 'register': 'Register', 'register_title': 'Register to HAVEN',
-        'individual': 'Individual', 'organization': 'Organization', 'full_name': 'Full Name',
-        'email_id': 'Email Address', 'phone_number': 'Phone Number', 'otp': 'OTP',
-        'password': 'Password', 'confirm_password': 'Confirm Password', 'address': 'Address',
-        'identity_verification': 'Identity Verification', 'document_type': 'Document Type',
-        'upload_document': 'Upload Document', 'register_button': 'Register',
-        'passwords_not_match': 'Passwords do not match!', 'org_name': 'Organization Name',
-        'org_phone': 'Organization Phone', 'org_type': 'Organization Type',
-        'org_description': 'Organization Description', 'contact_person': 'Contact Person',
-        'contact_email': 'Contact Email', 'org_verification': 'Organization Verification',
-        'cert_type': 'Certificate Type', 'upload_cert': 'Upload Certificate',
-        'not_registered': "Already have an account?"
-    },
-    'hi': {
-        'login': 'लॉग इन', 'register': 'रजिस्टर', 'register_title': 'हैवन से रजिस्टर करें',
-        'individual': 'व्यक्तिगत', 'organization': 'संगठन', 'full_name': 'पूरा नाम',
-        'email_id': 'ईमेल पता', 'phone_number': 'फ़ोन नंबर', 'otp': 'ओटीपी',
-        'password': 'पासवर्ड', 'confirm_password': 'पासवर्ड की पुष्टि करें', 'address': 'पता',
-        'identity_verification': 'पहचान सत्यापन', 'document_type': 'दस्तावेज़ का प्रकार',
-        'upload_document': 'दस्तावेज़ अपलोड करें', 'register_button': 'रजिस्टर करें',
-        'passwords_not_match': 'पासवर्ड मेल नहीं खाते हैं!', 'org_name': 'संगठन का नाम',
-        'org_phone': 'संगठन का फ़ोन', 'org_type': 'संगठन का प्रकार',
-        'org_description': 'संगठन का विवरण', 'contact_person': 'संपर्क व्यक्ति',
-        'contact_email': 'संपर्क ईमेल', 'org_verification': 'संगठन सत्यापन',
-        'cert_type': 'प्रमाणपत्र का प्रकार', 'upload_cert': 'प्रमाणपत्र अपलोड करें',
-        'not_registered': "पहले से ही एक खाता है?"
-    },
-    'ta': {
-        'login': 'உள்நுழைவு', 'register': 'பதிவு', 'register_title': 'ஹேவனில் பதிவு',
-        'individual': 'தனிநபர்', 'organization': 'அமைப்பு', 'full_name': 'முழு பெயர்',
-        'email_id': 'மின்னஞ்சல் முகவரி', 'phone_number': 'தொலைபேசி எண்', 'otp': 'OTP',
-        'password': 'கடவுச்சொல்', 'confirm_password': 'கடவுச்சொல்லை உறுதிப்படுத்து', 'address': 'முகவரி',
-        'identity_verification': 'அடையாள சரிபார்ப்பு', 'document_type': 'ஆவண வகை',
-        'upload_document': 'ஆவணத்தைப் பதிவேற்று', 'register_button': 'பதிவு செய்',
-        'passwords_not_match': 'கடவுச்சொற்கள் பொருந்தவில்லை!', 'org_name': 'அமைப்பின் பெயர்',
-        'org_phone': 'அமைப்பின் தொலைபேசி', 'org_type': 'அமைப்பின் வகை',
-        'org_description': 'அமைப்பின் விளக்கம்', 'contact_person': 'தொடர்பு நபர்',
-        'contact_email': 'தொடர்பு மின்னஞ்சல்', 'org_verification': 'அமைப்பின் சரிபார்ப்பு',
-        'cert_type': 'சான்றிதழ் வகை', 'upload_cert': 'சான்றிதழைப் பதிவேற்று',
-        'not_registered': 'ஏற்கனவே கணக்கு உள்ளதா?'
-    },
-    'te': {
-        'login': 'లాగిన్', 'register': 'నమోదు', 'register_title': 'HAVENలో నమోదు చేయండి',
-        'individual': 'వ్యక్తిగత', 'organization': 'సంస్థ', 'full_name': 'పూర్తి పేరు',
-        'email_id': 'ఇమెయిల్ చిరునామా', 'phone_number': 'ఫోన్ నంబర్', 'otp': 'ఓటిపి',
-        'password': 'పాస్వర్డ్', 'confirm_password': 'పాస్వర్డ్‌ను నిర్ధారించండి', 'address': 'చిరునామా',
-        'identity_verification': 'గుర్తింపు ధృవీకరణ', 'document_type': 'పత్రం రకం',
-        'upload_document': 'పత్రాన్ని అప్‌లోడ్ చేయండి', 'register_button': 'నమోదు చేయండి',
-        'passwords_not_match': 'పాస్‌వర్డ్‌లు సరిపోలడం లేదు!', 'org_name': 'సంస్థ పేరు',
-        'org_phone': 'సంస్థ ఫోన్', 'org_type': 'సంస్థ రకం',
-        'org_description': 'సంస్థ వివరణ', 'contact_person': 'సంప్రదింపు వ్యక్తి',
-        'contact_email': 'సంప్రదింపు ఇమెయిల్', 'org_verification': 'సంస్థ ధృవీకరణ',
-        'cert_type': 'సర్టిఫికేట్ రకం', 'upload_cert': 'సర్టిఫికేట్‌ను అప్‌లోడ్ చేయండి',
-        'not_registered': 'ఇప్పటికే ఖాతా ఉందా?'
-    }
-}
+# UI strings live in locales/<lang>/LC_MESSAGES/haven.po, compiled to .mo (see translation_catalog.py)
 
 SIMPLIFICATION_DICT = {
     'philanthropy': 'donating money to help people',
     'sustainability': 'using resources wisely to protect the environment for the future',
 }
 
+# Per-language glossaries; languages without one use the English glossary
+SIMPLIFICATION_DICTS = {
+    'en': SIMPLIFICATION_DICT,
+}
+
 # --- Shared Functions ---
 def get_translated_text(key, lang='en'):
-    return TRANSLATION_DICT.get(lang, {}).get(key, key)
+    """Looks up one UI string. Pages needing several should use get_bundle()."""
+    return get_catalog(lang).gettext(key)
+
+@st.cache_resource
+def get_glossary(lang='en'):
+    """Compiles a language's glossary once per process."""
+    return Glossary(SIMPLIFICATION_DICTS.get(lang, SIMPLIFICATION_DICT))
 
 def simplify_text(text, lang='en'):
-    for term, simple_term in SIMPLIFICATION_DICT.items():
-        text = text.replace(term, f"**{term}** (*{simple_term}*)")
-    return text
+    return get_glossary(lang).simplify(text)
+
+@st.cache_data(max_entries=2048)
+def _simplify_description(campaign_id, description_hash, lang, _description):
+    return simplify_text(_description, lang)
+
+def simplify_campaign_description(campaign, lang='en'):
+    """simplify_text() for a campaign description, memoized per (id, description hash, language)."""
+    description = campaign['description']
+    description_hash = hashlib.sha1(description.encode('utf-8')).hexdigest()
+    return _simplify_description(campaign['id'], description_hash, lang, description)
 
 def load_custom_css():
     st.markdown("""
@@ -117,43 +85,92 @@ def load_custom_css():
     </style>
     """, unsafe_allow_html=True)
 
+@timed("render_logo")
 def render_logo():
-    logo_path = "haven_logo.png"
-    if os.path.exists(logo_path):
-        with open(logo_path, "rb") as f:
-            logo_data = base64.b64encode(f.read()).decode()
-        st.markdown(f'<div style="text-align: center; margin-bottom: 2rem;"><img src="data:image/png;base64,{logo_data}" alt="HAVEN Logo" style="max-width: 200px;"></div>', unsafe_allow_html=True)
+    logo = get_asset("haven_logo.png")
+    if logo:
+        st.markdown(f'<div style="text-align: center; margin-bottom: 2rem;"><img src="{logo.url}" alt="HAVEN Logo" style="max-width: 200px;"></div>', unsafe_allow_html=True)
     else:
         st.markdown(f"<h1 style='text-align: center;'>HAVEN</h1>", unsafe_allow_html=True)
 
 # --- API Call & Mock Data Functions ---
-@st.cache_data(ttl=300)
+# Four rows of the three-column campaign grid
+CAMPAIGN_PAGE_SIZE = 12
+
+# Served when the backend catalogue endpoint is unavailable.
+# This mock data includes the 'verified' status from the workflow
+_MOCK_CAMPAIGNS = [
+    {"id": 1, "title": "Educate a Child in Rural India", "image": "https://placehold.co/600x300/E8D8B9/000000?text=Education", "current_amount": 7500, "target_amount": 10000, "donors_count": 120, "category": "Education", "verified": True, "description": "This campaign focuses on providing quality education and sustainability for underprivileged children."},
+    {"id": 2, "title": "Clean Water for a Village", "image": "https://placehold.co/600x300/B9E8D8/000000?text=Water", "current_amount": 12000, "target_amount": 15000, "donors_count": 250, "category": "Health", "verified": True, "description": "Help us bring clean and safe drinking water to a village in need. This project is a key part of our philanthropy."},
+    {"id": 3, "title": "New Art Project (Under Review)", "image": "https://placehold.co/600x300/D8B9E8/000000?text=Art", "current_amount": 500, "target_amount": 5000, "donors_count": 10, "category": "Community", "verified": False, "description": "A new community art project pending review."},
+]
+
+@st.cache_resource(show_spinner="Loading campaigns...")
+def get_catalogue_store():
+    """Process-wide catalogue, synced from the backend every [catalogue] refresh_interval seconds.
+
+    Only the first page is fetched before the first render; the rest of the
+    catalogue arrives in the background and pages pick it up on their next rerun.
+    """
+    store = CatalogueStore(get_background_client(BACKEND_URL), fallback=_MOCK_CAMPAIGNS)
+    store.load_first_page(CAMPAIGN_PAGE_SIZE)
+    return store.start(get_setting("catalogue", "refresh_interval", 30))
+
+def get_campaign_page(offset=0, limit=CAMPAIGN_PAGE_SIZE):
+    """Returns a single page of the campaign catalogue.
+
+    Returns a dict with the page 'items', the catalogue 'total' and 'version',
+    and the 'next_offset' to request (None on the last page).
+    """
+    return get_catalogue_store().page(offset, limit)
+
+def iter_campaigns():
+    """Iterates over a consistent snapshot of the catalogue."""
+    return iter(get_catalogue_store().campaigns)
+
 def get_all_campaigns():
-    # This mock data includes the 'verified' status from the workflow
-    return [
-        {"id": 1, "title": "Educate a Child in Rural India", "image": "https://placehold.co/600x300/E8D8B9/000000?text=Education", "current_amount": 7500, "target_amount": 10000, "donors_count": 120, "category": "Education", "verified": True, "description": "This campaign focuses on providing quality education and sustainability for underprivileged children."},
-        {"id": 2, "title": "Clean Water for a Village", "image": "https://placehold.co/600x300/B9E8D8/000000?text=Water", "current_amount": 12000, "target_amount": 15000, "donors_count": 250, "category": "Health", "verified": True, "description": "Help us bring clean and safe drinking water to a village in need. This project is a key part of our philanthropy."},
-        {"id": 3, "title": "New Art Project (Under Review)", "image": "https://placehold.co/600x300/D8B9E8/000000?text=Art", "current_amount": 500, "target_amount": 5000, "donors_count": 10, "category": "Community", "verified": False, "description": "A new community art project pending review."},
-    ]
+    """Returns the whole catalogue. Prefer iter_campaigns() or the shared get_campaign_index()."""
+    return get_catalogue_store().campaigns
+
+def get_catalogue_version():
+    """Returns a token that changes whenever the campaign catalogue does."""
+    return get_catalogue_store().version
+
+def get_campaign_index():
+    """The id/slug/category/verified lookups, shared across sessions and updated as the catalogue changes."""
+    return get_catalogue_store().index
+
+@st.cache_resource(max_entries=2, show_spinner="Preparing filters...")
+def get_campaign_facets(catalogue_version):
+    """Column store behind the Explore filters and Analytics, rebuilt once per catalogue version and shared across sessions."""
+    # Imported here so only the pages that use facets pay for importing NumPy
+    from campaign_facets import CampaignFacets
+    return CampaignFacets(get_campaign_index().campaigns, catalogue_version)
+
+def get_search_index():
+    """The full-text index, shared across sessions and updated as the catalogue changes."""
+    store = get_catalogue_store()
+    with st.spinner("Building search index..."):
+        return store.search_index
 
 def submit_campaign_for_review(campaign_data):
     print("Campaign submitted for review:", campaign_data)
     return {"status": "success", "message": "Project submitted for AI and Admin review."}
 
-@st.cache_data
 def get_individual_profile_data():
-    """Returns mock data for an individual user."""
+    """Returns mock data for an individual user; see profile_data for the per-user service."""
     return {
         "full_name": "R. Prakash", "email": "individual@test.com", "phone": "09936528585",
-        "address": "123 Main Street, Anytown, India", "donated_to": get_all_campaigns()[:1]
+        "address": "123 Main Street, Anytown, India",
+        # Campaign ids only; the records are read from the shared catalogue when rendered
+        "donated_to": [campaign["id"] for campaign in get_campaign_page(0, 1)["items"]]
     }
 
-@st.cache_data
 def get_organization_profile_data():
-    """Returns mock data for an organization user."""
+    """Returns mock data for an organization user; see profile_data for the per-user service."""
     return {
         "org_name": "Green Future Foundation", "contact_person": "Anjali Sharma",
         "contact_email": "org@test.com", "org_phone": "011-12345678", "org_type": "NGO",
         "org_description": "Dedicated to environmental sustainability and conservation projects.",
-        "created_campaigns": get_all_campaigns()[1:]
+        "created_campaigns": [campaign["id"] for campaign in get_all_campaigns()[1:]]
     }
\ No newline at end of file